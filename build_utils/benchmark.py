@@ -0,0 +1,224 @@
+"""
+Synthetic-scale benchmark for the static site build.
+
+This script generates a synthetic site next to a copy of `index.py` in a scratch
+directory: hundreds of templates (cycled from the real content pages), the real
+partials, CSS and JS, menu/catering data with thousands of items, and a tree of
+distinct source images. It then times a sequence of builds against it, each with
+`--profile`, so regressions in build time show up as the catalogue and page count grow:
+
+- `cold`: empty 'docs' and build cache.
+- `warm`: full rebuild with the build cache (templates, images, compression) in place.
+- `incremental-noop`: `--incremental` with nothing changed.
+- `incremental-template`: `--incremental` after editing one template.
+- `incremental-partial`: `--incremental` after editing the footer partial.
+
+Usage:
+    python benchmark.py --templates 300 --items 3000 --images 200 --jobs 4 --output results.json
+
+Image generation requires Pillow.
+"""
+from rich.console import Console
+from rich.table import Table
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = None
+
+# Initialize console for rich text output
+console = Console()
+
+# Repository layout the synthetic site is copied from
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+source_dir = os.path.abspath(os.path.join(current_script_dir, os.pardir, "src"))
+
+# Real templates cycled into synthetic pages; they need no page-specific context
+CONTENT_TEMPLATES = ["contact.hbs", "our-story.hbs", "privacy.hbs", "terms.hbs"]
+# Templates rendered from the synthetic menu data
+DATA_TEMPLATES = ["menu.hbs", "catering.hbs", "gallery.hbs"]
+ROOT_FILES = ["humans.txt", "manifest.json", "robots.txt", "sitemap.xml", "sw.js"]
+MENU_SECTIONS = ["salads", "flatbreads", "plates", "sandwiches", "sides"]
+CATERING_SECTIONS = ["salads", "flatbreads", "entrees", "extras", "sides"]
+SYNTHETIC_ENV = {"company": "Synthetic Grille", "title": "Synthetic Grille", "description": "Benchmark site",
+                 "url": "https://example.com/", "phone": "555-0100", "email": "bench@example.com", "menu": "menu/"}
+SYNTHETIC_IMAGE_SIZE = (1600, 1200)
+
+def generate_images(images_path: str, count: int, seed: int) -> list:
+    """
+    Writes `count` distinct JPEGs (gradient plus random shapes) and returns their paths.
+    """
+    if Image is None:
+        console.log("[bold red]Pillow is required to generate the synthetic image tree.[/bold red]")
+        sys.exit(1)
+    random_generator = random.Random(seed)
+    image_paths = []
+    for index in range(count):
+        # Spread images over nested folders so the tree looks like a real catalogue
+        folder = os.path.join(images_path, f"group-{index // 50:03d}")
+        os.makedirs(folder, exist_ok=True)
+        image = Image.linear_gradient("L").resize(SYNTHETIC_IMAGE_SIZE).convert("RGB")
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x, y = random_generator.randrange(SYNTHETIC_IMAGE_SIZE[0]), random_generator.randrange(SYNTHETIC_IMAGE_SIZE[1])
+            radius = random_generator.randrange(40, 300)
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=tuple(random_generator.randrange(256) for _ in range(3)))
+        file_path = os.path.join(folder, f"item_{index:05d}.jpg")
+        image.save(file_path, "JPEG", quality=85)
+        image_paths.append(file_path)
+    return image_paths
+
+def generate_menu_data(sections: list, item_count: int, image_paths: list, first_item_id: int, seed: int) -> dict:
+    """
+    Builds menuData.json-shaped data with `item_count` items spread over `sections`.
+
+    Each of the first `len(image_paths)` items gets an image of its own, so every one is
+    a distinct source for the derivative stage; the remaining items have no photo.
+    """
+    random_generator = random.Random(seed)
+    data = {section: {"header": section.upper(), "items": []} for section in sections}
+    for index in range(item_count):
+        section = sections[index % len(sections)]
+        item = {
+            "itemId": str(first_item_id + index),
+            "category": section.rstrip("s").title(),
+            "name": f"Synthetic Dish {index}",
+            "description": " ".join(random_generator.choice(["grilled", "fresh", "herbed", "smoky", "crisp", "tahini", "garlic", "lemon"]) for _ in range(18)),
+        }
+        if index < len(image_paths): item["image"] = image_paths[index]
+        if index % 3 == 0: item.update(small_price=f"${random_generator.randrange(8, 20)}.95", large_price=f"${random_generator.randrange(20, 40)}.95")
+        else: item["price"] = f"${random_generator.randrange(8, 30)}.95"
+        data[section]["items"].append(item)
+    return data
+
+def generate_site(work_dir: str, template_count: int, item_count: int, image_count: int, seed: int) -> None:
+    """
+    Lays out `work_dir` like the repository: 'build_utils' (with a copy of index.py), 'src' and 'docs'.
+    """
+    build_utils_path = os.path.join(work_dir, "build_utils")
+    synthetic_source_dir = os.path.join(work_dir, "src")
+    assets_path = os.path.join(synthetic_source_dir, "assets")
+    os.makedirs(build_utils_path, exist_ok=True)
+    shutil.copy2(os.path.join(current_script_dir, "index.py"), build_utils_path)
+    with open(os.path.join(build_utils_path, ".env"), "w", encoding="utf-8") as f:
+        f.writelines(f"{key}={value}\n" for key, value in SYNTHETIC_ENV.items())
+
+    # Real partials, styles, scripts, logos and root files
+    shutil.copytree(os.path.join(source_dir, "partials"), os.path.join(synthetic_source_dir, "partials"))
+    for folder in ["css", "js", os.path.join("images", "logo"), os.path.join("images", "favicon")]:
+        shutil.copytree(os.path.join(source_dir, "assets", folder), os.path.join(assets_path, folder))
+    os.makedirs(os.path.join(assets_path, "dist", "css"), exist_ok=True)
+    shutil.copy2(os.path.join(source_dir, "assets", "dist", "css", "bootstrap.min.css"), os.path.join(assets_path, "dist", "css"))
+    for file_name in ROOT_FILES: shutil.copy2(os.path.join(source_dir, file_name), synthetic_source_dir)
+
+    # Templates: the data-driven pages once, then content pages cycled up to the requested count
+    templates_path = os.path.join(synthetic_source_dir, "templates")
+    os.makedirs(templates_path, exist_ok=True)
+    for file_name in DATA_TEMPLATES: shutil.copy2(os.path.join(source_dir, "templates", file_name), templates_path)
+    for index in range(max(0, template_count - len(DATA_TEMPLATES))):
+        with open(os.path.join(source_dir, "templates", CONTENT_TEMPLATES[index % len(CONTENT_TEMPLATES)]), "r", encoding="utf-8") as f: template = f.read()
+        with open(os.path.join(templates_path, f"page-{index:04d}.hbs"), "w", encoding="utf-8") as f: f.write(template)
+
+    # Source images and menu/catering data referencing them
+    image_paths = [os.path.relpath(path, synthetic_source_dir).replace(os.sep, "/")
+                   for path in generate_images(os.path.join(assets_path, "images", "food", "synthetic"), image_count, seed)]
+    # Split like the item counts (catering gets a quarter as many), so no two items share an image
+    catering_item_count = max(1, item_count // 4)
+    menu_image_count = len(image_paths) * item_count // (item_count + catering_item_count)
+    menu_data_path = os.path.join(assets_path, "menu-data")
+    os.makedirs(menu_data_path, exist_ok=True)
+    with open(os.path.join(menu_data_path, "menuData.json"), "w", encoding="utf-8") as f:
+        json.dump(generate_menu_data(MENU_SECTIONS, item_count, image_paths[:menu_image_count], 0, seed), f)
+    with open(os.path.join(menu_data_path, "cateringData.json"), "w", encoding="utf-8") as f:
+        json.dump(generate_menu_data(CATERING_SECTIONS, catering_item_count, image_paths[menu_image_count:], 100000, seed + 1), f)
+
+def append_to_file(file_path: str, text: str) -> None:
+    with open(file_path, "a", encoding="utf-8") as f: f.write(text)
+
+def run_build(work_dir: str, name: str, extra_args: list, jobs: int) -> dict:
+    """
+    Runs one profiled build of the synthetic site and returns its wall time and per-stage timings.
+    """
+    build_utils_path = os.path.join(work_dir, "build_utils")
+    profile_path = os.path.join(work_dir, f"profile-{name}.json")
+    command = [sys.executable, "index.py", "--jobs", str(jobs), "--profile", profile_path, "--ignore-budgets"] + extra_args
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=build_utils_path, capture_output=True, text=True)
+    wall_seconds = time.perf_counter() - started
+    if completed.returncode != 0:
+        console.log(f"[bold red]Build '{name}' failed with exit code {completed.returncode}:[/bold red]\n{completed.stdout[-4000:]}{completed.stderr[-4000:]}")
+        sys.exit(1)
+    with open(profile_path, "r", encoding="utf-8") as f: profile = json.load(f)
+    console.log(f"Build '{name}': {wall_seconds:.2f} s")
+    return {"name": name, "wall_seconds": round(wall_seconds, 3), "stages": {stage["name"]: stage for stage in profile["stages"]},
+            "slowest_tasks": profile["slowest_tasks"][:5]}
+
+def run_benchmark(work_dir: str, jobs: int) -> list:
+    """
+    Runs the cold, warm and incremental builds described in the module docstring, in order.
+    """
+    source_path = os.path.join(work_dir, "src")
+    for path in [os.path.join(work_dir, "docs"), os.path.join(work_dir, "build_utils", ".build_cache")]:
+        if os.path.isdir(path): shutil.rmtree(path)
+    results = [run_build(work_dir, "cold", [], jobs), run_build(work_dir, "warm", [], jobs), run_build(work_dir, "incremental-noop", ["--incremental"], jobs)]
+    append_to_file(os.path.join(source_path, "templates", "menu.hbs"), "\n{{!-- benchmark edit --}}\n")
+    results.append(run_build(work_dir, "incremental-template", ["--incremental"], jobs))
+    append_to_file(os.path.join(source_path, "partials", "footer.hbs"), "\n{{!-- benchmark edit --}}\n")
+    results.append(run_build(work_dir, "incremental-partial", ["--incremental"], jobs))
+    return results
+
+def log_results(results: list) -> None:
+    """
+    Prints the wall time of each build and of each of its top-level stages as a table.
+    """
+    stage_names = [name for name in results[0]["stages"] if name != "build"]
+    table = Table(title="Build times")
+    table.add_column("stage")
+    for result in results: table.add_column(result["name"], justify="right")
+    table.add_row("total", *(f"{result['wall_seconds']:.2f} s" for result in results))
+    for name in stage_names:
+        table.add_row(name, *(f"{result['stages'].get(name, {}).get('wall_ms', 0):.0f} ms" for result in results))
+    console.print(table)
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses the command line options of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Time cold, warm and incremental builds of a synthetic site.")
+    parser.add_argument("--templates", type=int, default=200, help="Number of page templates.")
+    parser.add_argument("--items", type=int, default=2000, help="Number of menu items (catering gets a quarter as many).")
+    parser.add_argument("--images", type=int, default=100, help="Number of distinct source images, one per item for the first items of the menu and catering data.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N", help="Worker processes passed to index.py (0 = one per CPU core).")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the synthetic content.")
+    parser.add_argument("--workdir", help="Directory for the synthetic site (default: a temporary directory that is removed afterwards).")
+    parser.add_argument("--output", help="Write the results as JSON to this path.")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    if args.jobs <= 0: args.jobs = os.cpu_count() or 1
+    work_dir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix="site-benchmark-")
+    console.rule("[bold green]Build Benchmark[/bold green]")
+    try:
+        if os.path.isdir(os.path.join(work_dir, "src")): shutil.rmtree(os.path.join(work_dir, "src"))
+        started = time.perf_counter()
+        generate_site(work_dir, args.templates, args.items, args.images, args.seed)
+        console.log(f"Generated {args.templates} templates, {args.items} menu items and {args.images} images in {time.perf_counter() - started:.1f} s ({work_dir}).")
+        results = run_benchmark(work_dir, args.jobs)
+        log_results(results)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"templates": args.templates, "items": args.items, "images": args.images, "jobs": args.jobs, "python": sys.version.split()[0], "builds": results}, f, indent=2)
+            console.log(f"Results written to {args.output}.")
+    finally:
+        if not args.workdir: shutil.rmtree(work_dir, ignore_errors=True)
+    console.rule("[bold green]Benchmark Complete[/bold green]")
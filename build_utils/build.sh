@@ -9,7 +9,11 @@ dev() {
 # Set environment based on argument
 if [ "$1" == "dev" ]; then
     dev
+    shift
 fi
 
 # This script builds the project using python
-python index.py
+# Remaining arguments are passed through, e.g. `./build.sh dev --incremental`,
+# or `./build.sh dev --watch` for the live-reloading dev server on port 8000.
+# `./build.sh --targets` builds every URL in build-targets.json (production, GitHub Pages, LAN) at once
+python index.py "$@"
@@ -12,9 +12,78 @@ The main functions are:
 - `static_content_builder()`: Orchestrates the template compilation and HTML generation.
 - `copy_assets()`: Copies static assets and predefined root files.
 
+Passing `--jobs N` spreads page rendering, JS/CSS minification and file copies
+across a pool of N worker processes; output is identical to a serial build.
+
+Compiled templates and partials are cached on disk (keyed by source hash, pybars
+and Python version), so warm builds skip pybars compilation entirely.
+
+Image, menu-data and video folders are mirrored by a sync stage that compares size,
+mtime and content hash against a manifest, copying only new or changed files and
+pruning removed ones; `--link-assets hardlink|reflink` avoids duplicating bytes.
+
+The source `image` of every menu and catering item is turned into the square
+thumb/thumb400/thumb800/thumb1200 ladder (JPEG plus WebP variants) by a cached,
+parallel derivative stage, which fills those JSON fields in (requires Pillow).
+
+Every image under 'src/assets/images' (and every generated derivative) is recorded in a
+cached metadata index with its intrinsic size, format, bytes, dominant color and a tiny
+inline WebP placeholder; only changed files are re-read. Menu, catering and gallery cards
+get their `width`/`height` and placeholder from it, and the `{{img}}` helper renders any
+indexed image that way, so images neither shift the layout nor leave blank boxes.
+
+The menu, catering and gallery markup and their Schema.org JSON-LD are rendered at
+build time from the JSON data (see the `menu-sections` partial), so the client
+scripts only add interactivity and no menu data is inlined into those pages.
+
+The home page's hero animation frames are packed into a few concatenated bundles
+with a byte-offset index, plus reduced-resolution tiers for small viewports, which
+`heroFrames.js` loads instead of one request per frame.
+
+After minification, every CSS/JS file under 'docs/assets' gets a content-hashed copy
+(e.g. `custom_css.1a2b3c4d5e.css`); templates reference them through the `{{asset}}`
+helper, and remaining references in rendered HTML and `sw.js` are rewritten.
+
+Once pages are rendered, unused selectors are purged from `custom_css.css` (in Python,
+with the safelist of `nodejs/purge_css.js`) and each page gets its above-the-fold rules
+inlined in `<head>`, with the full stylesheet loaded without blocking render.
+
+Then a precache manifest (route or fingerprinted URL, content revision and size per
+file) is injected into `sw.js`, so a deploy only makes the service worker fetch the
+entries whose revision changed.
+
+Finally, every text output (HTML, CSS, JS, JSON, XML, ...) above a size threshold gets
+maximum-level `.gz` and, when the `brotli` module is installed, `.br` siblings for
+static precompressed serving; compressed bytes are cached by content hash.
+
+Every generated page is then analyzed for what it costs to load (local bytes, request
+count, render-blocking and external resources) into `.build_cache/performance-report.json`,
+and the build fails when a page exceeds its budget in `performance-budgets.json`
+(`--ignore-budgets` only reports).
+
+Passing `--profile [PATH]` records wall time, CPU time, files and bytes in/out per stage
+and per file (with pybars compile/render split per page) into a JSON file that also
+loads in chrome://tracing; `benchmark.py` times builds of synthetic sites at scale.
+
+Passing `--watch` serves 'docs' on a local dev server (`--port`, default 8000) and
+polls 'src' for changes, rebuilding only what each edit affects (one minified file, one
+page, or the pages including a partial) and notifying open pages to reload or swap
+stylesheets; production-only stages like fingerprinting and CSS purging are skipped.
+
+Passing `--targets [PATH]` builds every target in `build-targets.json` (a URL, `.env`
+overrides and an output folder each) in one pass: assets are minified, fingerprinted and
+derived, and the data is loaded, once into the first target's folder, then mirrored
+(linked with `--link-assets`) into the others; only the pages and what depends on them
+(critical CSS, precache manifest, compressed siblings, budgets) are produced per target.
+
+Passing `--incremental` skips the clean step and re-renders only the pages whose
+inputs (template, partials it includes, JSON data, `.env` context and `URL`)
+changed since the last build, as recorded in a persisted build manifest.
+
 The script uses `pybars` for Handlebars template compilation and `python-dotenv`
 for managing environment variables.
 """
+import pybars
 from pybars import Compiler
 from dotenv import dotenv_values
 from rich.console import Console
@@ -25,6 +94,34 @@ import rcssmin
 import rjsmin
 import subprocess
 import json
+import hashlib
+import gzip
+import re
+import argparse
+import fnmatch
+import unicodedata
+import base64
+import html
+import io
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+import marshal
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it the image derivative stage is skipped
+    Image = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip siblings are written
+    brotli = None
 
 # Initialize console for rich text output
 console = Console()
@@ -35,6 +132,7 @@ current_script_dir = os.path.dirname(os.path.abspath(__file__))
 # Output directory for the generated static site
 target_dir = os.path.join(current_script_dir, os.pardir, "docs")
 target_dir = os.path.abspath(target_dir)
+default_target_dir = target_dir  # `target_dir` moves to each output folder of a multi-target build
 
 # Source directory containing templates and assets
 source_dir = os.path.join(current_script_dir, os.pardir, "src")
@@ -52,6 +150,358 @@ menu_data_folder_path = os.path.join(source_assets_base, "menu-data")
 menu_data_file_path = os.path.join(menu_data_folder_path, "menuData.json")
 catering_data_file_path = os.path.join(menu_data_folder_path, "cateringData.json")
 
+# Persisted build state (manifests, caches) kept out of the published 'docs' folder
+cache_dir = os.path.join(current_script_dir, ".build_cache")
+build_manifest_path = os.path.join(cache_dir, "build-manifest.json")
+BUILD_MANIFEST_VERSION = 1
+
+# Asset folders mirrored into 'docs/assets' by the sync stage instead of being recopied every build
+SYNCED_ASSET_FOLDERS = ["images", "menu-data", "videos"]
+asset_sync_manifest_path = os.path.join(cache_dir, "asset-sync-manifest.json")
+ASSET_LINK_MODES = ["copy", "hardlink", "reflink"]
+FICLONE = 0x40049409  # Linux ioctl for copy-on-write clones (btrfs, xfs, ...)
+
+# Files copied as is from 'src' to the root of 'docs'
+ROOT_FILES = ["humans.txt", "manifest.json", "robots.txt", "sitemap.xml", "sw.js"]
+
+# Responsive image ladder generated from each menu/catering item's source image
+image_cache_dir = os.path.join(cache_dir, "images")
+DERIVED_IMAGES_FOLDER = "derived"
+IMAGE_LADDER_WIDTHS = [400, 800, 1200]
+IMAGE_JPEG_QUALITY = 82
+IMAGE_WEBP_QUALITY = 80
+IMAGE_PIPELINE_VERSION = 1  # bump when encoding settings change to invalidate cached derivatives
+PLACEHOLDER_IMAGE_FOLDERS = ["assets/images/logo/"]  # items showing a brand image have no dish photo of their own
+
+# Image metadata index: intrinsic size, format, bytes and an inline placeholder per image
+image_index_source_path = os.path.join(source_assets_base, "images")
+image_index_path = os.path.join(cache_dir, "image-index.json")
+image_metadata_cache_dir = os.path.join(cache_dir, "image-metadata")
+IMAGE_INDEX_EXTENSIONS = (".jpeg", ".jpg", ".png", ".webp", ".gif")
+IMAGE_PLACEHOLDER_SIZE = 16  # longest side, in pixels, of the preview the browser scales up (and so blurs)
+IMAGE_PLACEHOLDER_QUALITY = 40
+IMAGE_INDEX_VERSION = 1  # bump when metadata or placeholder settings change to invalidate cached entries
+
+# Hero scroll-animation frames, packed into a few byte-range bundles per resolution tier
+hero_frames_source_path = os.path.join(source_assets_base, "images", "hero", "frames")
+hero_cache_dir = os.path.join(cache_dir, "hero")
+HERO_FRAMES_FOLDER = "hero-frames"
+HERO_FRAME_TIER_WIDTHS = [640, 960]  # reduced tiers; the original frames always form the full tier
+HERO_FRAMES_PER_BUNDLE = 36  # the first frame always gets a bundle of its own so it paints early
+HERO_FRAME_JPEG_QUALITY = 75
+HERO_PACKER_VERSION = 1
+
+# Content-hashed copies of the minified CSS/JS, so they can be cached as immutable
+FINGERPRINTED_ASSET_FOLDERS = ["css", "js"]
+FINGERPRINT_LENGTH = 10
+FINGERPRINTED_NAME_PATTERN = re.compile(r"\.[0-9a-f]{%d}\.(css|js)$" % FINGERPRINT_LENGTH)
+ASSET_REFERENCE_PATTERN = re.compile(r"assets/((?:css|js)/[\w\-/\.]+?\.(?:css|js))(\?v=[\w\-\.]*)?(?=[\"'\s)>])")
+JS_IMPORT_PATTERN = re.compile(r"""(\bfrom\s*|\bimport\s*\(?\s*)(['"])(\.{1,2}/[^'"]+?\.js)\2""")
+ASSET_MAP_FILE_NAME = "asset-map.json"
+
+# Notes shown under a menu/catering section header, keyed by the header
+MENU_SECTION_NOTES = {
+    "PLATES": "All plates include yellow rice, hummus, tabbouleh, pita bread, and the appropriate sauce (garlic for chicken, tahini for beef/falafel, tzatziki for gyro).",
+    "SANDWICHES": "Includes the appropriate sauce inside: garlic for chicken, tahini for beef/falafel, tzatziki for gyro.",
+    "SALADS": "Served with vinaigrette on the side: balsamic, raspberry, lemon, house-made, or herb & vinegar.",
+}
+# Price fields of an item in display order, with the label used on cards and in Schema.org offers
+MENU_PRICE_FIELDS = [("per_piece_price", "Per piece"), ("per_flatbread_price", "Per flatbread"), ("per_skewer_price", "Per skewer")]
+
+# Unused-selector purge of the custom stylesheet and per-page critical CSS, same safelist as 'nodejs/purge_css.js'
+PURGED_STYLESHEETS = ["css/custom_css.css"]
+PURGE_SAFELIST = {
+    "modal", "fade", "show", "collapsing", "active", "open",
+    "fancybox-container", "fancybox-is-open", "fancybox-is-closing",
+    "dropdown-menu", "dropdown-item", "dropdown-toggle", "dropup", "dropright", "dropleft",
+    "collapse", "collapsed", "navbar-toggler", "navbar-collapse",
+    "data-bs-toggle", "data-bs-target", "data-bs-parent",
+    "is-valid", "is-invalid", "valid-feedback", "invalid-feedback",
+}
+PURGE_SAFELIST_PATTERNS = [re.compile(pattern) for pattern in [
+    r"^col-", r"^p-", r"^m-", r"^d-", r"^text-", r"^bg-", r"^border-",
+    r"^position-", r"^top-", r"^start-", r"^translate-",
+    r"^navbar-", r"^accordion-", r"^dropdown-",
+    r"^btn-outline-", r"^align-items-", r"^justify-content-", r"^flex-",
+    r"^d-(sm|md|lg|xl|xxl)-", r"^[wh]-\d+", r"^js-",
+]]
+CSS_GROUPING_AT_RULES = ("@media", "@supports", "@layer", "@container")
+CSS_CONTENT_TOKEN_PATTERN = re.compile(r"[\w-]+")
+SELECTOR_IGNORED_PATTERN = re.compile(r"::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?|\[[^\]]*\]")  # pseudo-classes/elements and attribute selectors
+SELECTOR_IDENTIFIER_PATTERN = re.compile(r"([.#]?)(-?[_a-zA-Z][\w-]*)")
+CRITICAL_FOLD_ELEMENTS = 150  # elements at the start of <body> treated as above the fold
+CRITICAL_CSS_BLOCK_PATTERN = re.compile(r"<style data-critical-css>.*?</style>", re.S)
+CRITICAL_STYLESHEET_PATTERN = re.compile(
+    r"(?:<style data-critical-css>.*?</style>\s*)?<link rel=\"stylesheet\" href=\"([^\"]+)\"[^>]*?data-critical-css>(?:\s*<noscript data-critical-css>.*?</noscript>)?", re.S)
+
+# Per-page load cost report and the budgets that fail the build when exceeded
+performance_budgets_path = os.path.join(current_script_dir, "performance-budgets.json")
+performance_report_path = os.path.join(cache_dir, "performance-report.json")
+RESOURCE_TYPES_BY_EXTENSION = {
+    ".css": "css", ".js": "js", ".mjs": "js", ".json": "other", ".bin": "frames",
+    ".jpg": "image", ".jpeg": "image", ".png": "image", ".webp": "image", ".avif": "image", ".gif": "image", ".svg": "image", ".ico": "image",
+    ".woff": "font", ".woff2": "font", ".ttf": "font", ".otf": "font",
+    ".mp4": "video", ".webm": "video", ".mov": "video",
+}
+HERO_FRAMES_INDEX_PATTERN = re.compile(r"window\.__HERO_FRAMES__\s*=\s*(\{.*?\});", re.S)
+
+# Files the service worker precaches, as glob patterns relative to 'docs' (unhashed names)
+PRECACHE_PATTERNS = ["index.html", "*/index.html", "manifest.json", "assets/css/custom_css.css",
+                     "assets/js/*.js", "assets/images/logo/red_logo_*.jpeg"]
+PRECACHE_REVISION_LENGTH = 12
+PRECACHE_MANIFEST_PATTERN = re.compile(r"const PRECACHE_MANIFEST = \[.*?\];", re.S)
+
+# Precompressed `.gz`/`.br` siblings of the text outputs in 'docs', cached by content hash
+compressed_cache_dir = os.path.join(cache_dir, "compressed")
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".json", ".xml", ".txt", ".svg", ".webmanifest")
+COMPRESSED_SUFFIXES = (".gz", ".br")
+COMPRESSION_MIN_BYTES = 1024  # below this the saved bytes don't outweigh the extra file and header overhead
+COMPRESSION_VERSION = 1  # bump when compression settings change to invalidate cached outputs
+
+# On-disk cache of compiled pybars templates, evicted least-recently-used first
+template_cache_dir = os.path.join(cache_dir, "templates")
+TEMPLATE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Build profiling (`--profile`): stage and task timings, saved as a summary plus Chrome trace events
+profile_default_path = os.path.join(cache_dir, "build-profile.json")
+PROFILE_SLOWEST_TASKS = 25
+_profile_events = None  # trace events of the current build, or None when not profiling
+_task_phases = None     # seconds per phase ("compile", "render") of the task running in this process
+
+# Multi-target builds (`--targets`): one pass renders every listed URL/env/output combination
+build_targets_default_path = os.path.join(current_script_dir, "build-targets.json")
+
+# Watch mode (`--watch`): polled sources, local dev server and its live-reload event stream
+WATCH_POLL_SECONDS = 0.25
+WATCH_SETTLE_SECONDS = 0.1  # editors often save in several writes; those are rebuilt together
+DEV_SERVER_PORT = 8000
+LIVE_RELOAD_PATH = "/__live-reload"
+LIVE_RELOAD_KEEPALIVE_SECONDS = 15
+LIVE_RELOAD_SCRIPT = """<script data-live-reload>
+(function () {
+  var source = new EventSource("%s");
+  source.onmessage = function (event) {
+    if (event.data !== "css") return location.reload();
+    document.querySelectorAll('link[rel="stylesheet"]').forEach(function (link) {
+      var url = new URL(link.href);
+      if (url.origin !== location.origin) return;
+      url.searchParams.set("live-reload", Date.now());
+      link.href = url.href;
+    });
+  };
+})();
+</script>""" % LIVE_RELOAD_PATH
+
+# Matches partial includes such as `{{> header}}`, `{{>footer}}` or `{{#> layout}}`
+PARTIAL_REFERENCE_PATTERN = re.compile(r"\{\{#?>\s*([\w\-/\.]+)")
+
+
+def hash_bytes(data: bytes) -> str:
+    """
+    Returns the SHA-256 hex digest of the given bytes.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(file_path: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a file's content, or an empty string if it does not exist.
+    """
+    if not os.path.isfile(file_path):
+        return ""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_value(value) -> str:
+    """
+    Returns a stable SHA-256 hex digest of a JSON-serialisable value (dict keys are sorted).
+    """
+    return hash_bytes(json.dumps(value, sort_keys=True, default=str).encode("utf-8"))
+
+def load_build_manifest() -> dict:
+    """
+    Loads the build manifest written by the previous run.
+
+    Returns:
+        dict: The manifest, or an empty one if it is missing, unreadable or from
+        a different manifest version.
+    """
+    empty_manifest = {"version": BUILD_MANIFEST_VERSION, "pages": {}, "assets": []}
+    if not os.path.isfile(build_manifest_path):
+        return empty_manifest
+    try:
+        with open(build_manifest_path, "r", encoding="utf-8") as f: manifest = json.load(f)
+    except Exception as e:
+        console.log(f"[yellow]Warning: Could not read build manifest, doing a full render: {e}[/yellow]")
+        return empty_manifest
+    if manifest.get("version") != BUILD_MANIFEST_VERSION:
+        return empty_manifest
+    manifest.setdefault("pages", {})
+    manifest.setdefault("assets", [])
+    return manifest
+
+def save_build_manifest(manifest: dict) -> None:
+    """
+    Atomically writes the build manifest to the cache directory.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = build_manifest_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f: json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, build_manifest_path)
+
+def remove_stale_output(output_path: str) -> None:
+    """
+    Deletes an output whose source is gone, together with its compressed siblings, and
+    its folder when nothing else is left in it.
+
+    Args:
+        output_path (str): The absolute path of the output inside the target folder.
+    """
+    for path in (output_path, *(output_path + suffix for suffix in COMPRESSED_SUFFIXES)):
+        if os.path.isfile(path): os.remove(path)
+    output_directory = os.path.dirname(output_path)
+    if output_directory != target_dir and not os.listdir(output_directory): os.rmdir(output_directory)
+
+def get_partial_dependencies(template_string: str, partials_path: str) -> list:
+    """
+    Resolves the partials a template pulls in, following nested partial includes.
+
+    Args:
+        template_string (str): The Handlebars source of the template.
+        partials_path (str): The directory containing the `.hbs` partials.
+
+    Returns:
+        list: Sorted names of every partial the template depends on, directly or transitively.
+    """
+    dependencies = set()
+    pending = list(PARTIAL_REFERENCE_PATTERN.findall(template_string))
+    while pending:
+        partial_name = pending.pop()
+        if partial_name in dependencies:
+            continue
+        dependencies.add(partial_name)
+        partial_file_path = os.path.join(partials_path, f"{partial_name}.hbs")
+        if os.path.isfile(partial_file_path):
+            with open(partial_file_path, "r", encoding="utf-8") as file:
+                pending.extend(PARTIAL_REFERENCE_PATTERN.findall(file.read()))
+    return sorted(dependencies)
+
+def get_page_data_dependencies(page: str) -> list:
+    """
+    Returns the JSON data files (and other build-time data) whose content is rendered into the given page.
+
+    Every page depends on the image index, since any template can use the `img` helper.
+    """
+    if page == "index":
+        return [image_index_source_path, hero_frames_source_path]
+    if page in ("gallery", "menu"):
+        return [image_index_source_path, menu_data_file_path]
+    if page == "catering":
+        return [image_index_source_path, catering_data_file_path]
+    return [image_index_source_path]
+
+def compute_page_inputs(file_name: str, templates_path: str, partials_path: str, base_context: dict, data_hashes: dict | None = None) -> dict:
+    """
+    Collects content hashes of everything a page's rendered output depends on.
+
+    Args:
+        file_name (str): The template file name (e.g. "menu.hbs").
+        templates_path (str): The directory containing the page templates.
+        partials_path (str): The directory containing the partials.
+        base_context (dict): The `.env`-derived context shared by all pages (including `url`).
+        data_hashes (dict | None): Hashes of the processed JSON data keyed by data file path;
+            files without an entry are hashed as they are on disk.
+
+    Returns:
+        dict: A mapping of input identifiers (relative paths, "context", "builder") to hashes.
+    """
+    source_file_path = os.path.join(templates_path, file_name)
+    with open(source_file_path, "r", encoding="utf-8") as source: template_string = source.read()
+    inputs = {
+        f"templates/{file_name}": hash_bytes(template_string.encode("utf-8")),
+        "context": hash_value(base_context),
+        "builder": hash_file(os.path.abspath(__file__)),
+    }
+    for partial_name in get_partial_dependencies(template_string, partials_path):
+        inputs[f"partials/{partial_name}.hbs"] = hash_file(os.path.join(partials_path, f"{partial_name}.hbs"))
+    for data_file_path in get_page_data_dependencies(file_name.replace(".hbs", "")):
+        inputs[os.path.relpath(data_file_path, source_dir).replace(os.sep, "/")] = (data_hashes or {}).get(data_file_path) or hash_file(data_file_path)
+    return inputs
+
+
+
+# Compiled templates already loaded in this process, keyed like the on-disk cache
+_loaded_templates = {}
+
+def get_template_cache_key(template_string: str) -> str:
+    """
+    Returns the cache key of a template: its source hash plus the pybars and Python versions.
+    """
+    return hash_bytes(f"{pybars.__version__}\0{sys.implementation.cache_tag}\0{template_string}".encode("utf-8"))
+
+def compile_cached(compiler: Compiler, template_string: str):
+    """
+    Compiles a Handlebars template, reusing earlier compilations where possible.
+
+    Templates are looked up first in this process, then in the on-disk cache of
+    marshalled code objects; only on a miss is pybars asked to compile the source.
+
+    Args:
+        compiler (Compiler): The Pybars compiler instance.
+        template_string (str): The Handlebars source to compile.
+
+    Returns:
+        callable: The compiled template's render function.
+    """
+    cache_key = get_template_cache_key(template_string)
+    if cache_key in _loaded_templates:
+        return _loaded_templates[cache_key]
+
+    cache_file_path = os.path.join(template_cache_dir, f"{cache_key}.bin")
+    code = None
+    if os.path.isfile(cache_file_path):
+        try:
+            with open(cache_file_path, "rb") as cache_file: code = marshal.loads(cache_file.read())
+            os.utime(cache_file_path)
+        except Exception as e:
+            console.log(f"[yellow]Warning: Ignoring unreadable template cache entry {cache_key[:12]}: {e}[/yellow]")
+            code = None
+    if code is None:
+        code = compile(compiler.precompile(template_string), f"<template {cache_key[:12]}>", "exec", dont_inherit=True)
+        try:
+            os.makedirs(template_cache_dir, exist_ok=True)
+            temp_path = f"{cache_file_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as cache_file: cache_file.write(marshal.dumps(code))
+            os.replace(temp_path, cache_file_path)
+        except OSError as e:
+            console.log(f"[yellow]Warning: Could not write template cache entry {cache_key[:12]}: {e}[/yellow]")
+
+    module = ModuleType(f"pybars._templates._cached_{cache_key[:16]}")
+    exec(code, module.__dict__)
+    _loaded_templates[cache_key] = module.__dict__["render"]
+    return _loaded_templates[cache_key]
+
+def prune_template_cache(max_bytes: int = TEMPLATE_CACHE_MAX_BYTES) -> None:
+    """
+    Evicts the least recently used compiled templates until the cache fits in `max_bytes`.
+    """
+    if not os.path.isdir(template_cache_dir):
+        return
+    entries = []
+    for file_name in os.listdir(template_cache_dir):
+        file_path = os.path.join(template_cache_dir, file_name)
+        if os.path.isfile(file_path):
+            file_stat = os.stat(file_path)
+            entries.append((file_stat.st_mtime, file_stat.st_size, file_path))
+    total_bytes = sum(size for _, size, _ in entries)
+    for _, size, file_path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        os.remove(file_path)
+        total_bytes -= size
+        console.log(f"Evicted compiled template from cache: {os.path.basename(file_path)}")
 
 def get_partials(compiler: Compiler) -> dict:
     """
@@ -74,11 +524,229 @@ def get_partials(compiler: Compiler) -> dict:
         partial_name = partial_file.replace(".hbs", "")
         try:
             with open(os.path.join(partials_path, partial_file), "r", encoding="utf-8") as file:
-                partials[partial_name] = compiler.compile(file.read())
+                partials[partial_name] = compile_cached(compiler, file.read())
         except Exception as e:
             console.log(f"[bold red]Error compiling partial {partial_file}: {e}[/bold red]")
     return partials
 
+# Handlebars helper functions
+def eq(this, arg1, arg2, **kwargs) -> bool: return arg1 == arg2
+def nq(this, arg1, arg2, **kwargs) -> bool: return arg1 != arg2
+def and_(this, arg1, arg2, **kwargs) -> bool: return arg1 and arg2
+
+# Asset map ("css/custom_css.css" -> "css/custom_css.1a2b3c4d5e.css") used while rendering
+_asset_map = {}
+
+def asset(this, path, **kwargs) -> str:
+    """
+    Handlebars helper resolving an asset path to its fingerprinted name: `{{url}}{{asset "js/menu.js"}}`.
+    """
+    return f"assets/{_asset_map.get(path, path)}"
+
+def rewrite_asset_references(content: str, asset_map: dict) -> str:
+    """
+    Rewrites `assets/css/...` and `assets/js/...` references (dropping `?v=` cache busters) to fingerprinted names.
+    """
+    def replace(match):
+        fingerprinted_path = asset_map.get(match.group(1))
+        return f"assets/{fingerprinted_path}" if fingerprinted_path else match.group(0)
+    return ASSET_REFERENCE_PATTERN.sub(replace, content)
+
+# Image metadata index and base URL of the page being rendered, used by the `img` helper
+_image_index = {}
+_image_base_url = ""
+
+def img(this, path, **kwargs) -> pybars.strlist:
+    """
+    Handlebars helper rendering an `<img>` with the image's intrinsic `width`/`height` and
+    an inline placeholder background from the image index; other hash arguments become
+    attributes, with a trailing underscore dropped for Python keywords:
+    `{{img "assets/images/logo.png" alt="Logo" class_="img-fluid" loading="lazy"}}`.
+    """
+    src = path if "://" in path or path.startswith("/") else f"{_image_base_url}{path}"
+    attributes = {"src": src}
+    metadata = lookup_image(_image_index, path, _image_base_url)
+    if metadata:
+        attributes.update(width=metadata["width"], height=metadata["height"])
+        placeholder_style = get_placeholder_style(metadata)
+        if placeholder_style: kwargs["style"] = f"background: {placeholder_style};{' ' + kwargs['style'] if kwargs.get('style') else ''}"
+    attributes.update((name.rstrip("_"), value) for name, value in kwargs.items())
+    return pybars.strlist(["<img " + " ".join(f'{name}="{html.escape(str(value))}"' for name, value in attributes.items() if value is not None) + ">"])
+
+template_helpers = {"eq": eq, "nq": nq, "and_": and_, "asset": asset, "img": img}
+
+# Partials compiled once per process (the build process or a pool worker)
+_compiled_partials = None
+
+def get_compiled_partials() -> dict:
+    """
+    Returns the compiled partials, compiling them on first use in the current process.
+    """
+    global _compiled_partials
+    if _compiled_partials is None:
+        _compiled_partials = get_partials(Compiler())
+    return _compiled_partials
+
+def cpu_seconds() -> float:
+    """
+    CPU time used by this process and its finished child processes (e.g. pool workers).
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+def start_profiling() -> None:
+    """
+    Starts collecting stage and task timings for `write_build_profile()`.
+    """
+    global _profile_events
+    _profile_events = []
+
+@contextmanager
+def profile_stage(name: str):
+    """
+    Records the wall and CPU time of a build stage, with the files and bytes read and
+    written by the tasks it ran, when profiling is enabled. Stages may be nested.
+    """
+    if _profile_events is None:
+        yield
+        return
+    first_event = len(_profile_events)
+    started, started_cpu = time.time(), cpu_seconds()
+    try:
+        yield
+    finally:
+        task_events = [event for event in _profile_events[first_event:] if event["cat"] == "task"]
+        _profile_events.append({
+            "name": name, "cat": "stage", "ph": "X", "pid": os.getpid(), "tid": 0,
+            "ts": started * 1e6, "dur": (time.time() - started) * 1e6,
+            "args": {
+                "cpu_ms": round((cpu_seconds() - started_cpu) * 1000, 3),
+                "files": len(task_events),
+                "bytes_in": sum(event["args"]["bytes_in"] for event in task_events),
+                "bytes_out": sum(event["args"]["bytes_out"] for event in task_events),
+            },
+        })
+
+@contextmanager
+def profile_phase(name: str):
+    """
+    Adds the wall time of a phase of the running task (such as template compilation) to its profile entry.
+    """
+    if _task_phases is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _task_phases[name] = _task_phases.get(name, 0.0) + time.perf_counter() - started
+
+def get_task_files(task_function, task_args: tuple) -> tuple[list, list]:
+    """
+    The files a build task reads and writes, for profiling.
+
+    The first path argument of a task is its input and later ones are outputs; page
+    renders and compression, whose arguments are not both paths, are special-cased.
+    """
+    if task_function.__name__ == "render_page":
+        return [os.path.join(source_dir, "templates", task_args[0])], [determine_output_path(task_args[0], task_args[2])]
+    if task_function.__name__ == "compress_file":
+        return [task_args[0]], [task_args[0] + suffix for suffix in COMPRESSED_SUFFIXES]
+    paths = [arg for arg in task_args if isinstance(arg, str) and os.sep in arg]
+    return paths[:1], paths[1:]
+
+def run_profiled_task(task: tuple) -> tuple[tuple[bool, str], dict]:
+    """
+    Runs a build task like `run_task()` and also returns its trace event (wall/CPU time, bytes in/out, phases).
+    """
+    global _task_phases
+    task_function, task_args = task
+    input_paths, output_paths = get_task_files(task_function, task_args)
+    _task_phases = {}
+    started, started_cpu = time.time(), time.process_time()
+    result = run_task(task)
+    duration, cpu_duration = time.time() - started, time.process_time() - started_cpu
+    phases, _task_phases = _task_phases, None
+    label = os.path.relpath(input_paths[0], os.path.abspath(os.path.join(current_script_dir, os.pardir))) if input_paths else ""
+    event = {
+        "name": f"{task_function.__name__} {label}".strip(), "cat": "task", "ph": "X", "pid": os.getpid(), "tid": 0,
+        "ts": started * 1e6, "dur": duration * 1e6,
+        "args": {
+            "file": label,
+            "success": result[0],
+            "cpu_ms": round(cpu_duration * 1000, 3),
+            "bytes_in": sum(os.path.getsize(path) for path in input_paths if os.path.isfile(path)),
+            "bytes_out": sum(os.path.getsize(path) for path in output_paths if os.path.isfile(path)),
+            **{f"{phase}_ms": round(seconds * 1000, 3) for phase, seconds in phases.items()},
+        },
+    }
+    return result, event
+
+def write_build_profile(profile_path: str) -> None:
+    """
+    Saves the collected timings to `profile_path` and logs the per-stage summary.
+
+    The file holds a "stages" summary (wall/CPU ms, files, bytes in/out), the slowest
+    tasks, and the raw "traceEvents", so it can also be opened in chrome://tracing or Perfetto.
+    """
+    if _profile_events is None: return
+    stages = [{"name": event["name"], "wall_ms": round(event["dur"] / 1000, 3), **event["args"]}
+              for event in sorted((event for event in _profile_events if event["cat"] == "stage"), key=lambda event: event["ts"])]
+    slowest_tasks = [{"name": event["name"], "wall_ms": round(event["dur"] / 1000, 3), **event["args"]}
+                     for event in sorted((event for event in _profile_events if event["cat"] == "task"), key=lambda event: -event["dur"])[:PROFILE_SLOWEST_TASKS]]
+    start_ts = min((event["ts"] for event in _profile_events), default=0)
+    trace_events = [{**event, "ts": round(event["ts"] - start_ts, 1), "dur": round(event["dur"], 1)} for event in _profile_events]
+
+    os.makedirs(os.path.dirname(os.path.abspath(profile_path)), exist_ok=True)
+    with open(profile_path, "w", encoding="utf-8") as f:
+        json.dump({"stages": stages, "slowest_tasks": slowest_tasks, "traceEvents": trace_events, "displayTimeUnit": "ms"}, f, indent=1)
+    for stage in stages:
+        console.log(f"Profile {stage['name']}: {stage['wall_ms']:.0f} ms wall, {stage['cpu_ms']:.0f} ms CPU, "
+                    f"{stage['files']} file(s), {stage['bytes_in'] / 1024:.1f} KiB in, {stage['bytes_out'] / 1024:.1f} KiB out")
+    console.log(f"Build profile written to {os.path.relpath(profile_path)}.")
+
+def run_task(task: tuple) -> tuple[bool, str]:
+    """
+    Runs a single `(function, args)` build task and turns unexpected exceptions into a failed result.
+    """
+    task_function, task_args = task
+    try:
+        return task_function(*task_args)
+    except Exception as e:
+        return False, f"[bold red]Error in {task_function.__name__}{task_args}: {e}[/bold red]"
+
+def run_tasks(tasks: list, jobs: int = 1) -> list:
+    """
+    Runs build tasks serially or across a process pool.
+
+    Each task is a `(function, args)` tuple whose function is defined at module level
+    (so it can be sent to a worker process) and returns a `(success, message)` tuple.
+
+    Args:
+        tasks (list): The `(function, args)` tasks to run.
+        jobs (int): The number of worker processes; 1 or less runs the tasks in this process.
+
+    Returns:
+        list: The `(success, message)` results, in the same order as `tasks`.
+    """
+    task_runner = run_task if _profile_events is None else run_profiled_task
+    if jobs <= 1 or len(tasks) <= 1:
+        results = [task_runner(task) for task in tasks]
+    else:
+        workers = min(jobs, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(task_runner, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    if _profile_events is None: return results
+    _profile_events.extend(event for _, event in results)
+    return [result for result, _ in results]
+
+def log_task_results(results: list) -> int:
+    """
+    Logs the messages of finished build tasks in order and returns the number of failures.
+    """
+    for _, message in results: console.log(message)
+    return sum(1 for success, _ in results if not success)
+
 def compile_template(compiler: Compiler, source_file_path: str, context: dict, partials: dict, helpers: dict) -> str | None:
     """
     Compiles and renders a single Handlebars template file into HTML.
@@ -96,8 +764,8 @@ def compile_template(compiler: Compiler, source_file_path: str, context: dict, p
     try:
         with open(source_file_path, "r", encoding="utf-8") as source:
             template_string = source.read()
-        template = compiler.compile(template_string)
-        return template(context, partials=partials, helpers=helpers)
+        with profile_phase("compile"): template = compile_cached(compiler, template_string)
+        with profile_phase("render"): return template(context, partials=partials, helpers=helpers)
     except FileNotFoundError:
         console.log(f"[bold red]Error: Template file not found at {os.path.relpath(source_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}[/bold red]")
         return None
@@ -128,198 +796,999 @@ def determine_output_path(source_file: str, target_dir_base: str) -> str:
     
 def prepend_base_url_to_images(data, base_url):
     """
-    Recursively prepend base_url to all 'image' fields in JSON-like dicts/lists.
+    Returns a copy of JSON-like dicts/lists with base_url prepended to all 'image' fields.
+
+    The input is left untouched, so loaded data can be shared by every page and build target.
     """
     if isinstance(data, dict):
+        prefixed_data = {}
         for k, v in data.items():
-            if (k == "image" or k == "thumb400" or k == "thumb800" or k == "thumb1200" or k == "thumb") and isinstance(v, str):
+            if (k == "image" or k == "thumb400" or k == "thumb800" or k == "thumb1200" or k == "thumb" or k.endswith("_webp")) and isinstance(v, str):
                 # Avoid double slashes
-                data[k] = f"{base_url.rstrip('/')}/{v.lstrip('/')}"
+                prefixed_data[k] = f"{base_url.rstrip('/')}/{v.lstrip('/')}"
             else:
-                prepend_base_url_to_images(v, base_url)
-    elif isinstance(data, list):
-        for item in data:
-            prepend_base_url_to_images(item, base_url)
+                prefixed_data[k] = prepend_base_url_to_images(v, base_url)
+        return prefixed_data
+    if isinstance(data, list):
+        return [prepend_base_url_to_images(item, base_url) for item in data]
+    return data
 
-def static_content_builder() -> None:
+def encode_image_ladder(source_file_path: str, cache_key: str) -> tuple[bool, str]:
     """
-    Orchestrates the generation of static HTML pages from Handlebars templates.
+    Encodes the square JPEG and WebP size ladder of one source image into the image cache.
+
+    Images are centre-cropped to a square (the shape of the menu and gallery cards) and
+    never upscaled. The outputs are written to a temporary folder that is renamed into
+    place, so a cache entry is either complete or absent.
 
-    It loads environment variables, current year, and dynamically loads
-    menu and catering data from JSON files. For each template, it prepares
-    the rendering context (including page-specific data like gallery items or
-    full menu/catering data) and compiles the template into an HTML file.
+    Args:
+        source_file_path (str): The original image in 'src'.
+        cache_key (str): The content hash identifying the cache entry.
+
+    Returns:
+        tuple[bool, str]: Whether the ladder was encoded, and a message to log.
     """
-    console.log(f"Starting static content build in '{os.path.relpath(source_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' -> '{os.path.relpath(target_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'")
-    compiler = Compiler()
-    partials = get_partials(compiler)
-    templates_path = os.path.join(source_dir, "templates")
+    entry_path = os.path.join(image_cache_dir, cache_key)
+    temp_entry_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(temp_entry_path, exist_ok=True)
+        with Image.open(source_file_path) as source_image:
+            source_image = ImageOps.exif_transpose(source_image).convert("RGB")
+            for width in IMAGE_LADDER_WIDTHS:
+                size = min(width, *source_image.size)
+                rung = ImageOps.fit(source_image, (size, size), Image.LANCZOS)
+                rung.save(os.path.join(temp_entry_path, f"{width}.jpeg"), "JPEG", quality=IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+                rung.save(os.path.join(temp_entry_path, f"{width}.webp"), "WEBP", quality=IMAGE_WEBP_QUALITY, method=4)
+        if os.path.isdir(entry_path): shutil.rmtree(temp_entry_path)
+        else: os.replace(temp_entry_path, entry_path)
+        return True, f"Encoded image ladder: {os.path.relpath(source_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}"
+    except Exception as e:
+        shutil.rmtree(temp_entry_path, ignore_errors=True)
+        return False, f"[bold red]Error encoding image ladder for {source_file_path}: {e}[/bold red]"
 
-    # Define Handlebars helper functions
-    def eq(this, arg1, arg2, **kwargs) -> bool: return arg1 == arg2
-    def nq(this, arg1, arg2, **kwargs) -> bool: return arg1 != arg2
-    def and_(this, arg1, arg2, **kwargs) -> bool: return arg1 and arg2
-    helpers = {"eq": eq, "nq": nq, "and_": and_}
+def is_placeholder_image(path) -> bool:
+    """
+    Tells whether an item's `image` is a stand-in (e.g. the logo) rather than a photo of the dish.
+    """
+    return isinstance(path, str) and path.lstrip("/").startswith(tuple(PLACEHOLDER_IMAGE_FOLDERS))
 
-    template_files = [f for f in os.listdir(templates_path) if f.endswith(".hbs") and os.path.isfile(os.path.join(templates_path, f))]
+def resolve_derivative_source(item: dict) -> str | None:
+    """
+    Picks the original a menu/catering item's image ladder is generated from.
 
-    # Load menu data from JSON
-    loaded_menu_data = {}
-    console.log(f"Loading menu data from {os.path.relpath(menu_data_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
-    if os.path.exists(menu_data_file_path):
-        try:
-            with open(menu_data_file_path, 'r', encoding='utf-8') as f: loaded_menu_data = json.load(f)
-            console.log("Successfully loaded menu data.")
-        except Exception as e: console.log(f"[bold red]Error loading menu data: {e}[/bold red]")
-    else: console.log(f"[yellow]Warning: Menu data file not found at {os.path.relpath(menu_data_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}[/yellow]")
+    The item's `image` is used when it exists and is not a placeholder (see
+    `PLACEHOLDER_IMAGE_FOLDERS`); otherwise the largest existing hand-made thumb
+    stands in for it.
 
-    # Load catering data from JSON
-    loaded_catering_data = {}
-    console.log(f"Loading catering data from {os.path.relpath(catering_data_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
-    if os.path.exists(catering_data_file_path):
-        try:
-            with open(catering_data_file_path, 'r', encoding='utf-8') as f: loaded_catering_data = json.load(f)
-            console.log("Successfully loaded catering data.")
-        except Exception as e: console.log(f"[bold red]Error loading catering data: {e}[/bold red]")
-    else: console.log(f"[yellow]Warning: Catering data file not found at {os.path.relpath(catering_data_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}[/yellow]")
+    Returns:
+        str | None: The source file path, or None if the item has no usable image.
+    """
+    candidates = [] if is_placeholder_image(item.get("image")) else ["image"]
+    for key in candidates + ["thumb1200", "thumb800", "thumb400"]:
+        value = item.get(key)
+        if isinstance(value, str) and value and "://" not in value:
+            file_path = os.path.join(source_dir, value.lstrip("/"))
+            if os.path.isfile(file_path): return file_path
+    return None
 
+def generate_image_derivatives(data_sets: list, jobs: int = 1) -> None:
+    """
+    Generates the responsive image ladder for every item in the menu/catering data.
 
-    for file_name in template_files:
-        console.log(f"Processing template: {file_name}")
-        
-        source_file_full_path = os.path.join(templates_path, file_name)
-        
-        # Initialize context for the current page
-        context = dotenv_values(env_file_path) if os.path.exists(env_file_path) else {}
-        context["page"] = file_name.replace(".hbs", "")
-        context["year"] = datetime.datetime.now().year
-        context["url"]  = os.getenv("URL") or context.get("url")
-        base_url = context.get("url", "")
+    Each item's source image is hashed; ladders missing from the content-hash cache
+    are encoded across `jobs` worker processes. The cached files are placed in
+    'docs/assets/derived' under content-hashed names, and each item's `thumb`,
+    `thumb400`, `thumb800`, `thumb1200` and matching `*_webp` fields are rewritten
+    to point at them (plus `image`, when the referenced file does not exist).
+    Derived files no longer referenced are pruned.
 
-        # Prepare context data based on the current page
-        if context["page"] == "gallery" and loaded_menu_data:
-            gallery_items_list = []
-            for section_key, section_data in loaded_menu_data.items():
-                if "items" in section_data and isinstance(section_data["items"], list):
-                    for item in section_data["items"]:
-                        if "image" in item and "thumb" in item:
-                            gallery_items_list.append({
-                                "category": item.get("category"),
-                                "name": item.get("name", "Untitled Item"),
-                                "alt_text": item.get("name", "Gallery Image"),
-                                "thumb400": item["thumb400"],
-                                "thumb800": item["thumb800"],
-                                "thumb1200":item["thumb1200"],
-                                "caption": item.get("description", item.get("name", "No caption provided."))
-                            })
-            # Inline gallery items as JSON string for client-side JavaScript
-            prepend_base_url_to_images(gallery_items_list, base_url) # Uncomment if images need base URL prepended, for prod they should stay relative
-            context["gallery_items"] = gallery_items_list
-            context["inlined_gallery_items_json"] = json.dumps(gallery_items_list)
-        
-        elif context["page"] == "menu" and loaded_menu_data:    
-            # Inline full menu data as JSON string for dynamic JS rendering
-            prepend_base_url_to_images(loaded_menu_data, base_url)
-            context["inlined_full_menu_data_json"] = json.dumps(loaded_menu_data)
-            console.log("Prepared full menu data for menu page.")
-            
-        elif context["page"] == "catering" and loaded_catering_data:
-            # Inline full catering data as JSON string for dynamic JS rendering
-            prepend_base_url_to_images(loaded_catering_data, base_url)
-            context["inlined_catering_data_json"] = json.dumps(loaded_catering_data)
-            console.log("Prepared full catering data for catering page.")
+    Args:
+        data_sets (list): Loaded menu/catering data dicts, updated in place.
+        jobs (int): The number of worker processes used for encoding.
+    """
+    if Image is None:
+        console.log("[yellow]Warning: Pillow is not installed; skipping responsive image derivatives.[/yellow]")
+        return
 
-        rendered_html = compile_template(compiler, source_file_full_path, context, partials, helpers)
+    derived_folder_path = os.path.join(target_dir, "assets", DERIVED_IMAGES_FOLDER)
+    items_by_source = {}
+    source_hashes = {}
+    for data in data_sets:
+        items = [item for section in data.values() if isinstance(section, dict) for item in section.get("items", []) if isinstance(item, dict)]
+        for item in items:
+            source_file_path = resolve_derivative_source(item)
+            if source_file_path is None:
+                console.log(f"[yellow]Warning: No source image for menu item '{item.get('name', item.get('itemId'))}'.[/yellow]")
+                continue
+            items_by_source.setdefault(source_file_path, []).append(item)
 
-        if rendered_html is None:
-            console.log(f"[yellow]Skipping {file_name} due to compilation error.[/yellow]")
-            continue
+    encode_tasks = []
+    for source_file_path in sorted(items_by_source):
+        cache_key = hash_value([IMAGE_PIPELINE_VERSION, IMAGE_LADDER_WIDTHS, IMAGE_JPEG_QUALITY, IMAGE_WEBP_QUALITY, hash_file(source_file_path)])
+        source_hashes[source_file_path] = cache_key
+        if not os.path.isdir(os.path.join(image_cache_dir, cache_key)):
+            encode_tasks.append((encode_image_ladder, (source_file_path, cache_key)))
+    os.makedirs(image_cache_dir, exist_ok=True)
+    failures = log_task_results(run_tasks(encode_tasks, jobs))
 
-        target_html_destination = determine_output_path(file_name, target_dir)
+    expected_file_names = set()
+    for source_file_path, items in items_by_source.items():
+        cache_key = source_hashes[source_file_path]
+        entry_path = os.path.join(image_cache_dir, cache_key)
+        if not os.path.isdir(entry_path): continue
+        # A hand-made rung standing in for the original keeps its base name ("hummus_1200" -> "hummus")
+        stem = re.sub(r"_\d+$", "", os.path.splitext(os.path.basename(source_file_path))[0])
+        derived_paths = {}
+        for width in IMAGE_LADDER_WIDTHS:
+            for extension in ("jpeg", "webp"):
+                file_name = f"{stem}-{cache_key[:10]}_{width}.{extension}"
+                target_file_path = os.path.join(derived_folder_path, file_name)
+                cached_file_path = os.path.join(entry_path, f"{width}.{extension}")
+                if not os.path.isfile(target_file_path) or os.path.getsize(target_file_path) != os.path.getsize(cached_file_path):
+                    os.makedirs(derived_folder_path, exist_ok=True)
+                    shutil.copy2(cached_file_path, target_file_path)
+                expected_file_names.add(file_name)
+                derived_paths[(width, extension)] = f"assets/{DERIVED_IMAGES_FOLDER}/{file_name}"
+        for item in items:
+            prefix = "/" if str(item.get("image") or item.get("thumb400") or "").startswith("/") else ""
+            for width in IMAGE_LADDER_WIDTHS:
+                item[f"thumb{width}"] = prefix + derived_paths[(width, "jpeg")]
+                item[f"thumb{width}_webp"] = prefix + derived_paths[(width, "webp")]
+            item["thumb"] = prefix + derived_paths[(IMAGE_LADDER_WIDTHS[0], "webp")]
+            image = item.get("image")
+            if not isinstance(image, str) or not os.path.isfile(os.path.join(source_dir, image.lstrip("/"))):
+                item["image"] = prefix + derived_paths[(IMAGE_LADDER_WIDTHS[-1], "jpeg")]
 
-        # Create output directory if it doesn't exist
-        output_directory = os.path.dirname(target_html_destination)
-        if not os.path.exists(output_directory): os.makedirs(output_directory, exist_ok=True)
+    if os.path.isdir(derived_folder_path):
+        for file_name in os.listdir(derived_folder_path):
+            if file_name not in expected_file_names: os.remove(os.path.join(derived_folder_path, file_name))
+    console.log(f"Image derivatives: {len(items_by_source)} source image(s), {len(encode_tasks) - failures} encoded, {failures} failed.")
 
-        try:
-            with open(target_html_destination, "w", encoding="utf-8") as html_file:
-                html_file.write(rendered_html)
-            console.log(f"Successfully generated: {os.path.relpath(target_html_destination, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
-        except IOError as e:
-            console.log(f"[bold red]Error writing HTML file {target_html_destination}: {e}[/bold red]")
+def read_image_metadata(source_file_path: str, cache_key: str) -> tuple[bool, str]:
+    """
+    Writes the metadata of one image (intrinsic size, format, bytes, dominant color and
+    an inline placeholder) to its entry in the image metadata cache.
+
+    The size is reported as displayed, i.e. after EXIF rotation. Images with transparency
+    get no color or placeholder, since a background would show through them.
+
+    Args:
+        source_file_path (str): The image file.
+        cache_key (str): The content hash identifying the cache entry.
 
-def preprocess() -> None:
+    Returns:
+        tuple[bool, str]: Whether the metadata was read, and a message to log.
     """
-    Prepares the target directory by cleaning its contents before a new build.
+    entry_path = os.path.join(image_metadata_cache_dir, f"{cache_key}.json")
+    try:
+        with Image.open(source_file_path) as image:
+            metadata = {"format": (image.format or "").lower(), "bytes": os.path.getsize(source_file_path), "color": None, "placeholder": None}
+            width, height = image.size
+            if image.getexif().get(0x0112) in (5, 6, 7, 8): width, height = height, width
+            metadata.update(width=width, height=height)
+            if image.mode not in ("RGBA", "LA", "PA") and "transparency" not in image.info:
+                image.draft("RGB", (IMAGE_PLACEHOLDER_SIZE * 4, IMAGE_PLACEHOLDER_SIZE * 4))  # JPEGs decode at a reduced scale
+                preview = ImageOps.exif_transpose(image).convert("RGB")
+                preview.thumbnail((IMAGE_PLACEHOLDER_SIZE, IMAGE_PLACEHOLDER_SIZE), Image.LANCZOS)
+                metadata["color"] = "#%02x%02x%02x" % preview.resize((1, 1), Image.BOX).getpixel((0, 0))
+                encoded_preview = io.BytesIO()
+                preview.save(encoded_preview, "WEBP", quality=IMAGE_PLACEHOLDER_QUALITY)
+                metadata["placeholder"] = "data:image/webp;base64," + base64.b64encode(encoded_preview.getvalue()).decode("ascii")
+        os.makedirs(image_metadata_cache_dir, exist_ok=True)
+        with open(f"{entry_path}.{os.getpid()}.tmp", "w", encoding="utf-8") as f: json.dump(metadata, f)
+        os.replace(f"{entry_path}.{os.getpid()}.tmp", entry_path)
+        return True, f"Indexed image: {os.path.relpath(source_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}"
+    except Exception as e:
+        return False, f"[bold red]Error reading image metadata of {source_file_path}: {e}[/bold red]"
 
-    This ensures a fresh build and removes any stale files from previous runs.
+def build_image_index(jobs: int = 1) -> dict:
     """
-    def delete_all_in_directory(directory_path: str) -> None:
-        if not os.path.isdir(directory_path):
-            raise NotADirectoryError(f"{directory_path} is not a valid directory.")
-        console.log(f"Cleaning directory: {os.path.relpath(directory_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
-        for item_name in os.listdir(directory_path):
-            item_path = os.path.join(directory_path, item_name)
-            try:
-                if os.path.isfile(item_path) or os.path.islink(item_path): os.remove(item_path)
-                elif os.path.isdir(item_path): shutil.rmtree(item_path)
-                console.log(f"Deleted: {os.path.relpath(item_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
-            except Exception as e: console.log(f"[bold red]Error deleting {item_path}: {e}[/bold red]")
+    Returns the metadata index of every image under 'src/assets/images' plus the generated
+    derivatives in 'docs/assets/derived', keyed by site path (e.g. "assets/images/logo.png").
 
-    console.log(f"Starting preprocess: Cleaning up target directory '{os.path.relpath(target_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'")
-    if os.path.exists(target_dir): delete_all_in_directory(target_dir)
-    else: console.log(f"Target directory '{os.path.relpath(target_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' does not exist. Creating it."); os.makedirs(target_dir, exist_ok=True)
+    The persisted index records each file's size and mtime; only files whose size or
+    mtime changed are re-hashed, and only content missing from the metadata cache is
+    read, across `jobs` worker processes.
 
-def copy_assets() -> None:
+    Returns:
+        dict: Site path -> {"width", "height", "format", "bytes", "color", "placeholder"}.
     """
-    Copies static assets (CSS, JS, images, JSON data) and root files to the target directory.
+    if Image is None:
+        console.log("[yellow]Warning: Pillow is not installed; skipping the image metadata index.[/yellow]")
+        return {}
 
-    It also minifies JavaScript files and performs final CSS minification.
-    """
-    console.log("Starting asset copying and minification process.")
-    os.makedirs(target_dir, exist_ok=True)
+    previous_index = {}
+    if os.path.isfile(image_index_path):
+        try:
+            with open(image_index_path, "r", encoding="utf-8") as f: previous_index = json.load(f)
+        except Exception as e: console.log(f"[yellow]Warning: Could not read image index, re-indexing everything: {e}[/yellow]")
+    if previous_index.get("version") != IMAGE_INDEX_VERSION: previous_index = {}
 
-    def ensure_target_dir_exists(filepath: str):
-        directory = os.path.dirname(filepath)
-        if not os.path.exists(directory): os.makedirs(directory, exist_ok=True)
+    image_files = {}
+    for folder_path, site_folder in [(image_index_source_path, "assets/images"), (os.path.join(target_dir, "assets", DERIVED_IMAGES_FOLDER), f"assets/{DERIVED_IMAGES_FOLDER}")]:
+        for root, dirs, files in os.walk(folder_path):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.lower().endswith(IMAGE_INDEX_EXTENSIONS):
+                    file_path = os.path.join(root, filename)
+                    image_files[f"{site_folder}/{os.path.relpath(file_path, folder_path).replace(os.sep, '/')}"] = file_path
 
-    target_assets_base = os.path.join(target_dir, "assets")
+    index_files = {}
+    metadata_tasks = []
+    queued_keys = set()
+    for site_path, file_path in image_files.items():
+        file_stat = os.stat(file_path)
+        entry = {"size": file_stat.st_size, "mtime_ns": file_stat.st_mtime_ns}
+        previous_entry = previous_index.get("files", {}).get(site_path, {})
+        if (previous_entry.get("size"), previous_entry.get("mtime_ns")) == (entry["size"], entry["mtime_ns"]): entry["key"] = previous_entry.get("key")
+        else: entry["key"] = hash_value([IMAGE_INDEX_VERSION, IMAGE_PLACEHOLDER_SIZE, IMAGE_PLACEHOLDER_QUALITY, hash_file(file_path)])
+        index_files[site_path] = entry
+        if not os.path.isfile(os.path.join(image_metadata_cache_dir, f"{entry['key']}.json")) and entry["key"] not in queued_keys:
+            metadata_tasks.append((read_image_metadata, (file_path, entry["key"])))
+            queued_keys.add(entry["key"])
+    failures = log_task_results(run_tasks(metadata_tasks, jobs))
 
-    # Copy and process Bootstrap CSS
-    source_bootstrap_path = os.path.join(source_assets_base, "dist", "css", "bootstrap.min.css")
-    target_bootstrap_path = os.path.join(target_assets_base, "css", "bootstrap.min.css")
+    image_index = {}
+    for site_path, entry in index_files.items():
+        try:
+            with open(os.path.join(image_metadata_cache_dir, f"{entry['key']}.json"), "r", encoding="utf-8") as f: image_index[site_path] = json.load(f)
+        except (OSError, ValueError): entry.pop("key")
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(image_index_path, "w", encoding="utf-8") as f: json.dump({"version": IMAGE_INDEX_VERSION, "files": index_files}, f, indent=2, sort_keys=True)
+
+    # Drop cached metadata of content no longer in the index
+    used_entries = {f"{entry['key']}.json" for entry in index_files.values() if entry.get("key")}
+    for file_name in os.listdir(image_metadata_cache_dir) if os.path.isdir(image_metadata_cache_dir) else []:
+        if file_name not in used_entries: os.remove(os.path.join(image_metadata_cache_dir, file_name))
+    console.log(f"Image index: {len(image_index)} image(s), {len(metadata_tasks) - failures} read, {failures} failed.")
+    return image_index
+
+def lookup_image(image_index: dict, path, base_url: str = "") -> dict | None:
+    """
+    Returns the indexed metadata of an image referenced by site path, with or without
+    the base URL or a leading slash, or None when the image is not indexed.
+    """
+    if not isinstance(path, str): return None
+    if base_url and path.startswith(base_url): path = path[len(base_url):]
+    return image_index.get(path.split("?", 1)[0].lstrip("/"))
+
+def get_placeholder_style(metadata: dict | None) -> str:
+    """
+    Returns the CSS `background` value that paints an image's placeholder until it loads.
+    """
+    if not metadata or not metadata.get("color"): return ""
+    if not metadata.get("placeholder"): return metadata["color"]
+    return f"{metadata['color']} url({metadata['placeholder']}) center / cover no-repeat"
+
+def get_image_fields(image_index: dict, path, base_url: str = "") -> dict:
+    """
+    Returns the `width`, `height` and `placeholder` template fields of an indexed image
+    (empty when it is not indexed), for merging into a card's context.
+    """
+    metadata = lookup_image(image_index, path, base_url)
+    if metadata is None: return {}
+    return {"width": metadata["width"], "height": metadata["height"], "placeholder": get_placeholder_style(metadata)}
+
+def encode_hero_frame(source_file_path: str, target_file_path: str, width: int) -> tuple[bool, str]:
+    """
+    Writes a downscaled JPEG copy of one hero frame for a reduced-resolution tier.
+
+    Returns:
+        tuple[bool, str]: Whether the frame was encoded, and a message to log.
+    """
+    try:
+        with Image.open(source_file_path) as frame:
+            height = round(frame.height * width / frame.width)
+            frame.convert("RGB").resize((width, height), Image.LANCZOS).save(target_file_path, "JPEG", quality=HERO_FRAME_JPEG_QUALITY, optimize=True)
+        return True, f"Encoded hero frame {os.path.basename(source_file_path)} at {width}px"
+    except Exception as e:
+        return False, f"[bold red]Error encoding hero frame {source_file_path} at {width}px: {e}[/bold red]"
+
+def pack_hero_frames(jobs: int = 1) -> dict | None:
+    """
+    Packs the hero frame sequence into a few bundles per resolution tier.
+
+    Each tier's frames are concatenated into bundles (the first frame alone, then
+    `HERO_FRAMES_PER_BUNDLE` frames each) and described by an index of
+    `[bundle, offset, length]` entries. Reduced tiers are encoded with Pillow across
+    `jobs` worker processes; without Pillow only the full-resolution tier is built.
+    Results are cached by the frames' content hash and published to
+    'docs/assets/hero-frames' under content-hashed names.
+
+    Args:
+        jobs (int): The number of worker processes used to encode reduced tiers.
+
+    Returns:
+        dict | None: The frame index inlined into the home page, or None if there are no frames.
+    """
+    if not os.path.isdir(hero_frames_source_path):
+        console.log(f"[yellow]Warning: Hero frames folder not found at {os.path.relpath(hero_frames_source_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}[/yellow]")
+        return None
+    frame_paths = [os.path.join(hero_frames_source_path, f) for f in sorted(os.listdir(hero_frames_source_path)) if f.lower().endswith((".jpeg", ".jpg"))]
+    if not frame_paths:
+        return None
+
+    if Image is None: console.log("[yellow]Warning: Pillow is not installed; packing hero frames at full resolution only.[/yellow]")
+    tier_widths = HERO_FRAME_TIER_WIDTHS if Image is not None else []
+    cache_key = hash_value([HERO_PACKER_VERSION, tier_widths, HERO_FRAMES_PER_BUNDLE, HERO_FRAME_JPEG_QUALITY, [hash_file(path) for path in frame_paths]])
+    entry_path = os.path.join(hero_cache_dir, cache_key)
+
+    if not os.path.isfile(os.path.join(entry_path, "index.json")):
+        console.log(f"Packing {len(frame_paths)} hero frames...")
+        temp_entry_path = f"{entry_path}.{os.getpid()}.tmp"
+        shutil.rmtree(temp_entry_path, ignore_errors=True)
+        full_size = None
+        if Image is not None:
+            with Image.open(frame_paths[0]) as first_frame: full_size = first_frame.size
+        tier_widths = [width for width in tier_widths if full_size and width < full_size[0]]
+
+        # Encode the reduced tiers frame by frame, then pack every tier into bundles
+        tier_frame_paths = {None: frame_paths}
+        encode_tasks = []
+        for width in tier_widths:
+            os.makedirs(os.path.join(temp_entry_path, str(width)), exist_ok=True)
+            tier_frame_paths[width] = [os.path.join(temp_entry_path, str(width), os.path.basename(path)) for path in frame_paths]
+            encode_tasks += [(encode_hero_frame, (source, target, width)) for source, target in zip(frame_paths, tier_frame_paths[width])]
+        encode_results = run_tasks(encode_tasks, jobs)
+        if any(not success for success, _ in encode_results):
+            log_task_results([result for result in encode_results if not result[0]])
+            shutil.rmtree(temp_entry_path, ignore_errors=True)
+            return None
+
+        bundle_ranges = [(0, 1)] + [(start, min(start + HERO_FRAMES_PER_BUNDLE, len(frame_paths))) for start in range(1, len(frame_paths), HERO_FRAMES_PER_BUNDLE)]
+        tiers = []
+        for width in tier_widths + [None]:
+            tier = {"width": width or (full_size[0] if full_size else None), "bundles": [], "frames": []}
+            for bundle_number, (start, end) in enumerate(bundle_ranges):
+                bundle_bytes = bytearray()
+                for frame_path in tier_frame_paths[width][start:end]:
+                    with open(frame_path, "rb") as frame_file: frame_bytes = frame_file.read()
+                    tier["frames"].append([bundle_number, len(bundle_bytes), len(frame_bytes)])
+                    bundle_bytes += frame_bytes
+                bundle_name = f"frames-{tier['width'] or 'full'}-{bundle_number}-{hash_bytes(bytes(bundle_bytes))[:10]}.bin"
+                with open(os.path.join(temp_entry_path, bundle_name), "wb") as bundle_file: bundle_file.write(bundle_bytes)
+                tier["bundles"].append(bundle_name)
+            tiers.append(tier)
+            if width: shutil.rmtree(os.path.join(temp_entry_path, str(width)))
+        with open(os.path.join(temp_entry_path, "index.json"), "w", encoding="utf-8") as f:
+            json.dump({"count": len(frame_paths), "type": "image/jpeg", "tiers": tiers}, f)
+        shutil.rmtree(entry_path, ignore_errors=True)
+        os.replace(temp_entry_path, entry_path)
+
+    # Keep only the current packing in the cache
+    for cached_name in os.listdir(hero_cache_dir):
+        if cached_name != cache_key: shutil.rmtree(os.path.join(hero_cache_dir, cached_name), ignore_errors=True)
+
+    with open(os.path.join(entry_path, "index.json"), "r", encoding="utf-8") as f: hero_frames_index = json.load(f)
+    published_folder_path = os.path.join(target_dir, "assets", HERO_FRAMES_FOLDER)
+    os.makedirs(published_folder_path, exist_ok=True)
+    bundle_names = {name for tier in hero_frames_index["tiers"] for name in tier["bundles"]}
+    for bundle_name in bundle_names:
+        cached_bundle_path = os.path.join(entry_path, bundle_name)
+        published_bundle_path = os.path.join(published_folder_path, bundle_name)
+        if not os.path.isfile(published_bundle_path) or os.path.getsize(published_bundle_path) != os.path.getsize(cached_bundle_path):
+            shutil.copy2(cached_bundle_path, published_bundle_path)
+    for file_name in os.listdir(published_folder_path):
+        if file_name not in bundle_names: os.remove(os.path.join(published_folder_path, file_name))
+    for tier in hero_frames_index["tiers"]:
+        tier["bundles"] = [f"assets/{HERO_FRAMES_FOLDER}/{name}" for name in tier["bundles"]]
+    console.log(f"Hero frames: {hero_frames_index['count']} frames in {len(bundle_names)} bundle(s) across {len(hero_frames_index['tiers'])} tier(s).")
+    return hero_frames_index
+
+def render_page(file_name: str, context: dict, output_root: str, asset_map: dict | None = None, image_index: dict | None = None) -> tuple[bool, str]:
+    """
+    Renders a single page template with its prepared context and writes the HTML file.
+
+    This runs inside pool workers when building with `--jobs`, so it only takes
+    picklable arguments and reports problems through its return value.
+
+    Args:
+        file_name (str): The template file name (e.g. "menu.hbs").
+        context (dict): The fully prepared rendering context for the page.
+        output_root (str): The target folder the page is written into; passed explicitly
+            because workers started with `spawn` do not see the build target selected here.
+        asset_map (dict | None): The fingerprinted asset names used by the `asset` helper
+            and for rewriting literal asset references in the output.
+        image_index (dict | None): The image metadata used by the `img` helper.
+
+    Returns:
+        tuple[bool, str]: Whether the page was written, and a message to log.
+    """
+    global _asset_map, _image_index, _image_base_url
+    _asset_map = asset_map or {}
+    _image_index = image_index or {}
+    _image_base_url = context.get("url") or ""
+    source_file_full_path = os.path.join(source_dir, "templates", file_name)
+    rendered_html = compile_template(Compiler(), source_file_full_path, context, get_compiled_partials(), template_helpers)
+
+    if rendered_html is None:
+        return False, f"[yellow]Skipping {file_name} due to compilation error.[/yellow]"
+    if _asset_map: rendered_html = rewrite_asset_references(rendered_html, _asset_map)
+
+    target_html_destination = determine_output_path(file_name, output_root)
+
+    # Create output directory if it doesn't exist
+    output_directory = os.path.dirname(target_html_destination)
+    if not os.path.exists(output_directory): os.makedirs(output_directory, exist_ok=True)
+
+    try:
+        with open(target_html_destination, "w", encoding="utf-8") as html_file:
+            html_file.write(rendered_html)
+        return True, f"Successfully generated: {os.path.relpath(target_html_destination, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}"
+    except IOError as e:
+        return False, f"[bold red]Error writing HTML file {target_html_destination}: {e}[/bold red]"
+
+def slugify(text: str, suffix=None) -> str:
+    """
+    Turns a name into a URL fragment (accents stripped, non-alphanumerics hyphenated), with an optional suffix such as the item id.
+    """
+    core = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode("ascii").lower()
+    core = re.sub(r"[^a-z0-9]+", "-", core).strip("-")
+    return f"{core}-{suffix}" if suffix is not None else core
+
+def parse_price(price) -> str | None:
+    """
+    Returns a price such as "$16.50" or 16.5 as the plain decimal string Schema.org expects, or None.
+    """
+    if isinstance(price, (int, float)): return f"{price:.2f}"
+    match = re.search(r"\d+(?:\.\d+)?", str(price or "").replace(",", "."))
+    return f"{float(match.group(0)):.2f}" if match else None
+
+def get_price_lines(item: dict) -> list:
+    """
+    The price text of a menu item as shown on its card, one entry per line.
+    """
+    for field, label in MENU_PRICE_FIELDS:
+        if item.get(field): return [f"{label}: {item[field]}"]
+    if item.get("small_price") and item.get("large_price"): return [f"Small {item['small_price']}", f"Large {item['large_price']}"]
+    if item.get("price"): return [str(item["price"])]
+    return []
+
+def build_menu_sections(menu_data: dict, image_index: dict | None = None, base_url: str = "") -> list:
+    """
+    Prepares menu or catering data for the `menu-sections` partial.
+
+    Each section gets its anchor key, header, optional note and the card fields of
+    its items; `price` keeps the `<br>`-joined form `itemModal.js` reads from `data-price`,
+    and `width`/`height`/`placeholder` come from the image index entry of `thumb400`.
+    """
+    sections = []
+    for section_key, section_data in menu_data.items():
+        items = []
+        for item in section_data.get("items", []):
+            price_lines = get_price_lines(item)
+            item_id = item.get("itemId") or "-1"
+            items.append({
+                "slug": slugify(item.get("name"), item.get("itemId")),
+                "item_id": item_id,
+                "name": item.get("name", ""),
+                "description": item.get("description", ""),
+                "alt_text": " ".join(part for part in [item.get("name"), item.get("category"), "menu item"] if part),
+                "price": "<br>".join(price_lines),
+                "price_lines": price_lines,
+                "images_json": json.dumps(item.get("images") or []),
+                **{key: item.get(key) for key in ["thumb400", "thumb800", "thumb1200", "thumb400_webp", "thumb800_webp", "thumb1200_webp"]},
+                "width": 400, "height": 400,  # the ladder's square crop, unless the index knows better
+                **get_image_fields(image_index or {}, item.get("thumb400"), base_url),
+            })
+        sections.append({"key": section_key, "header": section_data.get("header", section_key.upper()), "note": MENU_SECTION_NOTES.get(section_data.get("header")), "items": items})
+    return sections
+
+def build_menu_schema(menu_data: dict, name: str, page_url: str) -> dict:
+    """
+    Builds the Schema.org `Menu` graph of a menu or catering page, with one `Offer` per item
+    linking to the item's card anchor.
+    """
+    menu_sections = []
+    for section_key, section_data in menu_data.items():
+        menu_items = []
+        for item in section_data.get("items", []):
+            offer = {"@type": "Offer", "priceCurrency": "USD",
+                     "availability": "https://schema.org/InStock" if item.get("available", True) else "https://schema.org/OutOfStock",
+                     "url": f"{page_url}#{slugify(item.get('name'), item.get('itemId'))}"}
+            if item.get("price"):
+                price = parse_price(item["price"])
+            elif item.get("small_price") or item.get("large_price"):
+                price = parse_price(item.get("small_price") or item.get("large_price"))
+                offer["name"] = " / ".join(get_price_lines(item)) if item.get("small_price") and item.get("large_price") else ("Small" if item.get("small_price") else "Large")
+            else:
+                field, label = next(((field, label) for field, label in MENU_PRICE_FIELDS if item.get(field)), (None, None))
+                price = parse_price(item.get(field)) if field else None
+                if label: offer["name"] = label
+            if price: offer["price"] = price
+            menu_item = {"@type": "MenuItem", "name": item.get("name", "Item"), "description": item.get("description", "")}
+            image = item.get("image") or item.get("thumb")
+            if image: menu_item["image"] = image
+            menu_item["offers"] = offer
+            menu_items.append(menu_item)
+        menu_sections.append({"@type": "MenuSection", "name": section_data.get("header", section_key.upper()), "hasMenuItem": menu_items})
+    return {"@context": "https://schema.org", "@type": "Menu", "name": name, "url": page_url, "hasMenuSection": menu_sections}
+
+def build_gallery_schema(gallery_items: list, company: str, site_url: str, page_url: str) -> dict:
+    """
+    Builds the Schema.org `CollectionPage` graph of the gallery page.
+    """
+    return {
+        "@context": "https://schema.org",
+        "@type": "CollectionPage",
+        "name": "Gallery",
+        "description": "A feast for the eyes — explore Tigris Mediterranean Grille's signature dishes, warm ambiance, and catering highlights.",
+        "url": page_url,
+        "publisher": {"@type": "Restaurant", "name": company, "url": site_url},
+        "hasPart": [{
+            "@type": "ImageObject",
+            "name": f"{item['name']} {item.get('category') or ''}".strip(),
+            "caption": item.get("caption", ""),
+            "description": item.get("alt_text", ""),
+            "contentUrl": item.get("thumb1200"),
+            "thumbnailUrl": item.get("thumb400"),
+        } for item in gallery_items],
+    }
+
+def json_for_script(value) -> str:
+    """
+    Serializes a value for a `<script>` element, escaping `</` so the data cannot close the element.
+    """
+    return json.dumps(value, ensure_ascii=False).replace("</", "<\\/")
+
+def load_site_data(jobs: int = 1) -> dict:
+    """
+    Loads the menu and catering data from JSON and runs the build-time stages they feed:
+    image derivatives (which fill in the thumb fields), hero frame packing and the image
+    metadata index. Derived files are written to the current target folder.
+
+    The result is read-only for the page builder, so one load serves every build target.
+
+    Args:
+        jobs (int): The number of worker processes used for image processing.
+
+    Returns:
+        dict: "menu_data", "catering_data", "hero_frames_index", "image_index" and the
+            "data_hashes" of those inputs, keyed by source path.
+    """
+    # Load menu data from JSON
+    loaded_menu_data = {}
+    console.log(f"Loading menu data from {os.path.relpath(menu_data_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
+    if os.path.exists(menu_data_file_path):
+        try:
+            with open(menu_data_file_path, 'r', encoding='utf-8') as f: loaded_menu_data = json.load(f)
+            console.log("Successfully loaded menu data.")
+        except Exception as e: console.log(f"[bold red]Error loading menu data: {e}[/bold red]")
+    else: console.log(f"[yellow]Warning: Menu data file not found at {os.path.relpath(menu_data_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}[/yellow]")
+
+    # Load catering data from JSON
+    loaded_catering_data = {}
+    console.log(f"Loading catering data from {os.path.relpath(catering_data_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
+    if os.path.exists(catering_data_file_path):
+        try:
+            with open(catering_data_file_path, 'r', encoding='utf-8') as f: loaded_catering_data = json.load(f)
+            console.log("Successfully loaded catering data.")
+        except Exception as e: console.log(f"[bold red]Error loading catering data: {e}[/bold red]")
+    else: console.log(f"[yellow]Warning: Catering data file not found at {os.path.relpath(catering_data_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}[/yellow]")
+
+    # Fill in the responsive image ladder before anything is hashed or rendered
+    with profile_stage("image derivatives"): generate_image_derivatives([loaded_menu_data, loaded_catering_data], jobs)
+    with profile_stage("hero frames"): hero_frames_index = pack_hero_frames(jobs)
+    with profile_stage("image index"): image_index = build_image_index(jobs)
+    data_hashes = {menu_data_file_path: hash_value(loaded_menu_data), catering_data_file_path: hash_value(loaded_catering_data),
+                   hero_frames_source_path: hash_value(hero_frames_index), image_index_source_path: hash_value(image_index)}
+    return {"menu_data": loaded_menu_data, "catering_data": loaded_catering_data, "hero_frames_index": hero_frames_index,
+            "image_index": image_index, "data_hashes": data_hashes}
+
+def static_content_builder(incremental: bool = False, jobs: int = 1, asset_map: dict | None = None,
+                           site_data: dict | None = None, env_overrides: dict | None = None) -> None:
+    """
+    Orchestrates the generation of static HTML pages from Handlebars templates.
+
+    It loads environment variables, current year, and the menu and catering
+    data (see `load_site_data()`). For each template, it prepares
+    the rendering context (including page-specific data like gallery items,
+    menu/catering sections and their Schema.org graphs) and compiles the
+    template into an HTML file.
+
+    Args:
+        incremental (bool): When True, pages whose inputs match the previous build
+            manifest (and whose output still exists) are not re-rendered, and outputs
+            of templates that no longer exist are deleted.
+        jobs (int): The number of worker processes used to render pages.
+        asset_map (dict | None): Fingerprinted CSS/JS names from `fingerprint_assets()`.
+        site_data (dict | None): Data from `load_site_data()`, loaded here when not given.
+        env_overrides (dict | None): Context values replacing those of `.env` and `URL`,
+            e.g. the `url` of a build target.
+    """
+    console.log(f"Starting static content build in '{os.path.relpath(source_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' -> '{os.path.relpath(target_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'")
+    templates_path = os.path.join(source_dir, "templates")
+    partials_path = os.path.join(source_dir, "partials")
+
+    template_files = sorted(f for f in os.listdir(templates_path) if f.endswith(".hbs") and os.path.isfile(os.path.join(templates_path, f)))
+
+    # Context shared by every page; its hash is part of each page's build inputs
+    base_context = dotenv_values(env_file_path) if os.path.exists(env_file_path) else {}
+    base_context["year"] = datetime.datetime.now().year
+    base_context["url"]  = os.getenv("URL") or base_context.get("url")
+    base_context.update(env_overrides or {})
+
+    # Data, image derivatives and indexes are shared by every page (and every build target)
+    if site_data is None: site_data = load_site_data(jobs)
+    loaded_menu_data = site_data["menu_data"]
+    loaded_catering_data = site_data["catering_data"]
+    hero_frames_index = site_data["hero_frames_index"]
+    image_index = site_data["image_index"]
+    data_hashes = site_data["data_hashes"]
+    asset_map_hash = hash_value(asset_map or {})
+
+    # Work out which pages need rendering by comparing their inputs with the last build
+    previous_manifest = load_build_manifest() if incremental else {"pages": {}}
+    manifest_pages = {}
+    pages_to_render = []
+    for file_name in template_files:
+        page_inputs = compute_page_inputs(file_name, templates_path, partials_path, base_context, data_hashes)
+        page_inputs["asset-map"] = asset_map_hash
+        fingerprint = hash_value(page_inputs)
+        previous_entry = previous_manifest["pages"].get(file_name)
+        output_exists = os.path.isfile(determine_output_path(file_name, target_dir))
+        if incremental and previous_entry and previous_entry.get("fingerprint") == fingerprint and output_exists:
+            manifest_pages[file_name] = previous_entry
+            console.log(f"Unchanged, skipping template: {file_name}")
+            continue
+        if incremental and previous_entry:
+            changed_inputs = sorted(k for k in set(page_inputs) | set(previous_entry.get("inputs", {})) if page_inputs.get(k) != previous_entry.get("inputs", {}).get(k))
+            console.log(f"Rebuilding {file_name}: {', '.join(changed_inputs) or 'output missing'}")
+        pages_to_render.append((file_name, page_inputs, fingerprint))
+
+    # Delete outputs of templates that were removed since the last build
+    for file_name, previous_entry in previous_manifest["pages"].items():
+        if file_name in template_files: continue
+        stale_output_path = os.path.join(target_dir, previous_entry.get("output", ""))
+        if os.path.isfile(stale_output_path):
+            remove_stale_output(stale_output_path)
+            console.log(f"Deleted output of removed template {file_name}: {os.path.relpath(stale_output_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
+
+    if not pages_to_render:
+        console.log("All pages are up to date.")
+        save_build_manifest({**load_build_manifest(), "pages": manifest_pages})
+        return
+
+    # Contexts are prepared here, in order, so rendering can happen in any process
+    page_tasks = []
+    for file_name, page_inputs, fingerprint in pages_to_render:
+        console.log(f"Processing template: {file_name}")
+
+        # Initialize context for the current page
+        context = dict(base_context)
+        context["page"] = file_name.replace(".hbs", "")
+        base_url = context.get("url", "")
+
+        # Prepare context data based on the current page
+        if context["page"] == "gallery" and loaded_menu_data:
+            gallery_items_list = []
+            for section_key, section_data in loaded_menu_data.items():
+                if "items" in section_data and isinstance(section_data["items"], list):
+                    for item in section_data["items"]:
+                        if "image" in item and "thumb" in item:
+                            gallery_items_list.append({
+                                "category": item.get("category"),
+                                "name": item.get("name", "Untitled Item"),
+                                "alt_text": item.get("name", "Gallery Image"),
+                                "thumb400": item["thumb400"],
+                                "thumb800": item["thumb800"],
+                                "thumb1200":item["thumb1200"],
+                                "thumb400_webp": item.get("thumb400_webp"),
+                                "thumb800_webp": item.get("thumb800_webp"),
+                                "thumb1200_webp": item.get("thumb1200_webp"),
+                                "caption": item.get("description", item.get("name", "No caption provided.")),
+                                "width": 400, "height": 400,  # the ladder's square crop, unless the index knows better
+                                **get_image_fields(image_index, item["thumb400"], base_url),
+                            })
+            gallery_items_list = prepend_base_url_to_images(gallery_items_list, base_url) # Uncomment if images need base URL prepended, for prod they should stay relative
+            context["gallery_items"] = gallery_items_list
+            context["gallery_schema_json"] = json_for_script(build_gallery_schema(
+                gallery_items_list, context.get("company", ""), base_url, f"{base_url.rstrip('/')}/gallery/"))
+        
+        elif context["page"] == "index":
+            # Byte-range index of the packed hero frame bundles for heroFrames.js
+            context["inlined_hero_frames_json"] = json.dumps(hero_frames_index)
+
+        elif context["page"] == "menu" and loaded_menu_data:
+            # Menu sections and their Schema.org graph are rendered here rather than in the browser
+            menu_data = prepend_base_url_to_images(loaded_menu_data, base_url)
+            context["menu_sections"] = build_menu_sections(menu_data, image_index, base_url)
+            context["menu_schema_json"] = json_for_script(build_menu_schema(
+                menu_data, f"{context.get('company', '')} Menu", f"{base_url.rstrip('/')}/menu/"))
+            console.log("Prepared menu sections for menu page.")
+
+        elif context["page"] == "catering" and loaded_catering_data:
+            # Catering sections and their Schema.org graph are rendered here rather than in the browser
+            catering_data = prepend_base_url_to_images(loaded_catering_data, base_url)
+            context["menu_sections"] = build_menu_sections(catering_data, image_index, base_url)
+            context["menu_schema_json"] = json_for_script(build_menu_schema(
+                catering_data, f"{context.get('company', '')} Catering Menu", f"{base_url.rstrip('/')}/catering/"))
+            console.log("Prepared catering sections for catering page.")
+
+        page_tasks.append((render_page, (file_name, context, target_dir, asset_map, image_index)))
+
+    # Compile partials up front so forked workers inherit them
+    with profile_stage("compile partials"): get_compiled_partials()
+    with profile_stage("render pages"): results = run_tasks(page_tasks, jobs)
+    for (file_name, page_inputs, fingerprint), (success, message) in zip(pages_to_render, results):
+        console.log(message)
+        if success:
+            manifest_pages[file_name] = {
+                "fingerprint": fingerprint,
+                "inputs": page_inputs,
+                "output": os.path.relpath(determine_output_path(file_name, target_dir), target_dir).replace(os.sep, "/"),
+            }
+
+    save_build_manifest({**load_build_manifest(), "pages": manifest_pages})
+    prune_template_cache()
+
+def preprocess(preserved_paths: list | None = None) -> None:
+    """
+    Prepares the target directory by cleaning its contents before a new build.
+
+    This ensures a fresh build and removes any stale files from previous runs.
+
+    Args:
+        preserved_paths (list | None): Directories left in place (along with the folders
+            leading to them), e.g. the synced asset folders, which prune their own stale files.
+    """
+    preserved_paths = [os.path.abspath(path) for path in (preserved_paths or [])]
+
+    def delete_all_in_directory(directory_path: str) -> None:
+        if not os.path.isdir(directory_path):
+            raise NotADirectoryError(f"{directory_path} is not a valid directory.")
+        console.log(f"Cleaning directory: {os.path.relpath(directory_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
+        for item_name in os.listdir(directory_path):
+            item_path = os.path.join(directory_path, item_name)
+            if item_path in preserved_paths:
+                console.log(f"Kept for asset sync: {os.path.relpath(item_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
+                continue
+            if os.path.isdir(item_path) and not os.path.islink(item_path) and any(path.startswith(item_path + os.sep) for path in preserved_paths):
+                delete_all_in_directory(item_path)
+                continue
+            try:
+                if os.path.isfile(item_path) or os.path.islink(item_path): os.remove(item_path)
+                elif os.path.isdir(item_path): shutil.rmtree(item_path)
+                console.log(f"Deleted: {os.path.relpath(item_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
+            except Exception as e: console.log(f"[bold red]Error deleting {item_path}: {e}[/bold red]")
+
+    console.log(f"Starting preprocess: Cleaning up target directory '{os.path.relpath(target_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'")
+    if os.path.exists(target_dir): delete_all_in_directory(target_dir)
+    else: console.log(f"Target directory '{os.path.relpath(target_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' does not exist. Creating it."); os.makedirs(target_dir, exist_ok=True)
+
+def copy_file(source_file_path: str, target_file_path: str) -> tuple[bool, str]:
+    """
+    Copies a single file (with metadata) into the target directory.
+
+    Returns:
+        tuple[bool, str]: Whether the file was copied, and a message to log.
+    """
+    try:
+        os.makedirs(os.path.dirname(target_file_path), exist_ok=True)
+        shutil.copy2(source_file_path, target_file_path)
+        return True, f"Copied '{os.path.relpath(source_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' to '{os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'."
+    except Exception as e:
+        return False, f"[bold red]Error copying {source_file_path}: {e}[/bold red]"
+
+def minify_js(source_file_path: str, target_file_path: str) -> tuple[bool, str]:
+    """
+    Minifies a JavaScript file with rjsmin, copying the original if minification fails.
+
+    Returns:
+        tuple[bool, str]: Whether the file was minified, and a message to log.
+    """
+    os.makedirs(os.path.dirname(target_file_path), exist_ok=True)
+    try:
+        with open(source_file_path, 'r', encoding='utf-8') as f_in: content = f_in.read()
+        minified_content = rjsmin.jsmin(content)
+        with open(target_file_path, 'w', encoding='utf-8') as f_out: f_out.write(minified_content)
+        return True, f"Minified JS: {os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}"
+    except Exception as e:
+        shutil.copy2(source_file_path, target_file_path)
+        return False, f"[bold red]Error processing JS {os.path.basename(source_file_path)}: {e}. Copied original.[/bold red]"
+
+def minify_css(source_file_path: str, target_file_path: str) -> tuple[bool, str]:
+    """
+    Minifies a CSS file with rcssmin, copying the original if minification fails.
+
+    Returns:
+        tuple[bool, str]: Whether the file was minified, and a message to log.
+    """
+    os.makedirs(os.path.dirname(target_file_path), exist_ok=True)
+    try:
+        with open(source_file_path, 'r', encoding='utf-8') as f_in: content = f_in.read()
+        minified_content = rcssmin.cssmin(content)
+        with open(target_file_path, 'w', encoding='utf-8') as f_out: f_out.write(minified_content)
+        return True, f"Minified final CSS: {os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}"
+    except Exception as e:
+        shutil.copy2(source_file_path, target_file_path)
+        return False, f"[bold red]Error minifying CSS {os.path.basename(source_file_path)}: {e}. Copied original.[/bold red]"
+
+def get_asset_task(source_file_path: str) -> tuple | None:
+    """
+    Returns the `(function, args)` task that places a source CSS/JS file in 'docs/assets'.
+
+    Bootstrap's prebuilt CSS and the custom stylesheets are minified into 'assets/css',
+    plain scripts are minified into 'assets/js' and anything else under 'js' (e.g.
+    `.min.js` files) is copied as is. Other paths return None.
+    """
+    target_assets_base = os.path.join(target_dir, "assets")
+    relative_path = os.path.relpath(source_file_path, source_assets_base).replace(os.sep, "/")
+    target_file_path = os.path.join(target_assets_base, relative_path)
+    if relative_path == "dist/css/bootstrap.min.css": return minify_css, (source_file_path, os.path.join(target_assets_base, "css", "bootstrap.min.css"))
+    if relative_path.startswith("css/") and relative_path.endswith(".css"): return minify_css, (source_file_path, target_file_path)
+    if relative_path.startswith("js/"):
+        if relative_path.endswith(".js") and not relative_path.endswith(".min.js"): return minify_js, (source_file_path, target_file_path)
+        return copy_file, (source_file_path, target_file_path)
+    return None
+
+def reflink_file(source_file_path: str, target_file_path: str) -> bool:
+    """
+    Clones a file with a copy-on-write reflink (Linux `FICLONE`).
+
+    Returns:
+        bool: True if the clone was made, False if the platform or filesystem does not support it.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(source_file_path, "rb") as source_file, open(target_file_path, "wb") as target_file:
+        try: fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+        except OSError: return False
+    shutil.copystat(source_file_path, target_file_path)
+    return True
+
+def sync_file(source_file_path: str, target_file_path: str, link_mode: str = "copy") -> tuple[bool, str]:
+    """
+    Places one source asset at its target path, replacing whatever was there.
+
+    Args:
+        source_file_path (str): The asset in 'src'.
+        target_file_path (str): Where the asset belongs in 'docs'.
+        link_mode (str): "copy", "hardlink" or "reflink"; links fall back to a copy when unsupported.
+
+    Returns:
+        tuple[bool, str]: Whether the file was placed, and a message to log.
+    """
+    try:
+        os.makedirs(os.path.dirname(target_file_path), exist_ok=True)
+        if os.path.lexists(target_file_path): os.remove(target_file_path)
+        placed_by = "Copied"
+        if link_mode == "hardlink":
+            try: os.link(source_file_path, target_file_path); placed_by = "Hard-linked"
+            except OSError: shutil.copy2(source_file_path, target_file_path)
+        elif link_mode == "reflink" and reflink_file(source_file_path, target_file_path): placed_by = "Reflinked"
+        else: shutil.copy2(source_file_path, target_file_path)
+        return True, f"{placed_by} '{os.path.relpath(source_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' to '{os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'."
+    except Exception as e:
+        return False, f"[bold red]Error syncing {source_file_path}: {e}[/bold red]"
+
+def sync_asset_folders(jobs: int = 1, link_mode: str = "copy") -> None:
+    """
+    Mirrors the asset folders in `SYNCED_ASSET_FOLDERS` from 'src/assets' to 'docs/assets'.
+
+    A source file is only copied (or linked) when it is new, its target is missing or
+    has the wrong size, or its content hash differs from the one recorded in the sync
+    manifest. Hashes are only recomputed when a file's size or mtime changed. Target
+    files without a source are pruned.
+
+    Args:
+        jobs (int): The number of worker processes used for the copies.
+        link_mode (str): "copy", "hardlink" or "reflink".
+    """
+    target_assets_base = os.path.join(target_dir, "assets")
+    previous_manifest = {}
+    if os.path.isfile(asset_sync_manifest_path):
+        try:
+            with open(asset_sync_manifest_path, "r", encoding="utf-8") as f: previous_manifest = json.load(f)
+        except Exception as e: console.log(f"[yellow]Warning: Could not read asset sync manifest, re-syncing everything: {e}[/yellow]")
+
+    sync_manifest = {}
+    sync_tasks = []
+    unchanged_count = 0
+    pruned_count = 0
+    for folder_name in SYNCED_ASSET_FOLDERS:
+        source_folder_path = os.path.join(source_assets_base, folder_name)
+        target_folder_path = os.path.join(target_assets_base, folder_name)
+        if not os.path.isdir(source_folder_path):
+            console.log(f"[yellow]Warning: Source directory '{os.path.relpath(source_folder_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' not found.[/yellow]")
+            if os.path.isdir(target_folder_path): shutil.rmtree(target_folder_path)
+            continue
+
+        expected_target_paths = set()
+        for root, dirs, files in os.walk(source_folder_path):
+            dirs.sort()
+            for filename in sorted(files):
+                source_file_path = os.path.join(root, filename)
+                relative_path = os.path.relpath(source_file_path, source_assets_base).replace(os.sep, "/")
+                target_file_path = os.path.join(target_assets_base, relative_path)
+                expected_target_paths.add(target_file_path)
+
+                source_stat = os.stat(source_file_path)
+                entry = {"size": source_stat.st_size, "mtime_ns": source_stat.st_mtime_ns, "mode": link_mode}
+                previous_entry = previous_manifest.get(relative_path, {})
+                target_matches = os.path.isfile(target_file_path) and os.path.getsize(target_file_path) == source_stat.st_size and previous_entry.get("mode") == link_mode
+                if target_matches and (previous_entry.get("size"), previous_entry.get("mtime_ns")) == (entry["size"], entry["mtime_ns"]):
+                    entry["sha256"] = previous_entry.get("sha256")
+                else:
+                    entry["sha256"] = hash_file(source_file_path)
+                sync_manifest[relative_path] = entry
+                if target_matches and entry["sha256"] == previous_entry.get("sha256"):
+                    unchanged_count += 1
+                    continue
+                sync_tasks.append((sync_file, (source_file_path, target_file_path, link_mode)))
+
+        # Prune target files whose source is gone, then any directories left empty
+        for root, dirs, files in os.walk(target_folder_path, topdown=False):
+            for filename in files:
+                target_file_path = os.path.join(root, filename)
+                if filename.endswith(COMPRESSED_SUFFIXES) and os.path.splitext(target_file_path)[0] in expected_target_paths: continue
+                if target_file_path not in expected_target_paths:
+                    os.remove(target_file_path)
+                    pruned_count += 1
+                    console.log(f"Pruned: {os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
+            if root != target_folder_path and not os.listdir(root): os.rmdir(root)
+
+    results = run_tasks(sync_tasks, jobs)
+    failures = log_task_results(results)
+    for (_, (source_file_path, _, _)), (success, _) in zip(sync_tasks, results):
+        if not success: sync_manifest.pop(os.path.relpath(source_file_path, source_assets_base).replace(os.sep, "/"), None)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(asset_sync_manifest_path, "w", encoding="utf-8") as f: json.dump(sync_manifest, f, indent=2, sort_keys=True)
+    console.log(f"Synced asset folders ({link_mode}): {len(sync_tasks) - failures} updated, {pruned_count} pruned, {unchanged_count} unchanged.")
+
+def copy_assets(jobs: int = 1, link_mode: str = "copy") -> None:
+    """
+    Copies static assets (CSS, JS, images, JSON data) and root files to the target directory.
+
+    It also minifies JavaScript files and performs final CSS minification. The per-file
+    work is collected as tasks and run across `jobs` worker processes. Image, menu-data
+    and video folders are mirrored by `sync_asset_folders()`.
+
+    Args:
+        jobs (int): The number of worker processes used for minification and copies.
+        link_mode (str): How synced assets are placed: "copy", "hardlink" or "reflink".
+    """
+    console.log("Starting asset copying and minification process.")
+    os.makedirs(target_dir, exist_ok=True)
+
+    target_assets_base = os.path.join(target_dir, "assets")
+    asset_tasks = []
+
+    # Bootstrap CSS
+    source_bootstrap_path = os.path.join(source_assets_base, "dist", "css", "bootstrap.min.css")
     if os.path.isfile(source_bootstrap_path):
-        ensure_target_dir_exists(target_bootstrap_path)
-        shutil.copy2(source_bootstrap_path, target_bootstrap_path)
-        console.log(f"Copied '{os.path.basename(source_bootstrap_path)}' to '{os.path.relpath(target_bootstrap_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'.")
+        asset_tasks.append(get_asset_task(source_bootstrap_path))
     else: console.log(f"[yellow]Warning: Bootstrap CSS not found at '{os.path.relpath(source_bootstrap_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'[/yellow]")
 
-    # Copy and process custom CSS
+    # Custom CSS
     source_custom_css_folder = os.path.join(source_assets_base, "css")
-    target_custom_css_folder = os.path.join(target_assets_base, "css")
     if os.path.isdir(source_custom_css_folder):
-        if not os.path.exists(target_custom_css_folder): os.makedirs(target_custom_css_folder, exist_ok=True)
         for root, _, files in os.walk(source_custom_css_folder):
-            for filename in files:
+            for filename in sorted(files):
                 if filename.endswith(".css"):
-                    source_file_path = os.path.join(root, filename)
-                    relative_path = os.path.relpath(source_file_path, source_custom_css_folder)
-                    target_file_path = os.path.join(target_custom_css_folder, relative_path)
-                    ensure_target_dir_exists(target_file_path)
-                    shutil.copy2(source_file_path, target_file_path)
-                    console.log(f"Copied '{os.path.basename(source_file_path)}' to '{os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'.")
+                    asset_tasks.append(get_asset_task(os.path.join(root, filename)))
     else: console.log(f"[yellow]Warning: Custom CSS folder not found at '{os.path.relpath(source_custom_css_folder, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'[/yellow]")
 
-    # Copy asset folders like 'images' and 'menu-data'
-    folder_names_to_copy_from_assets = ["images", "menu-data", "videos"] 
-    for folder_name in folder_names_to_copy_from_assets:
-        source_folder_path = os.path.join(source_assets_base, folder_name)
-        target_folder_path = os.path.join(target_assets_base, folder_name)
-        if os.path.isdir(source_folder_path):
-            if os.path.exists(target_folder_path): shutil.rmtree(target_folder_path)
-            shutil.copytree(source_folder_path, target_folder_path)
-            console.log(f"Copied '{os.path.relpath(source_folder_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' to '{os.path.relpath(target_folder_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' as is.")
-        else: console.log(f"[yellow]Warning: Source directory '{os.path.relpath(source_folder_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' not found.[/yellow]")
+    # Unused selectors are purged after rendering, by `purge_and_inline_css()`
+
+    # JavaScript files: minify plain scripts, copy everything else as is
+    source_js_folder = os.path.join(source_assets_base, "js")
+    if os.path.isdir(source_js_folder):
+        for root, _, files in os.walk(source_js_folder):
+            for filename in sorted(files):
+                asset_tasks.append(get_asset_task(os.path.join(root, filename)))
+    else: console.log(f"[yellow]Warning: Source JS folder not found at '{os.path.relpath(source_js_folder, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'[/yellow]")
+
+    console.log(f"Processing {len(asset_tasks)} asset file(s) with {max(1, jobs)} job(s)...")
+    asset_outputs = [os.path.relpath(task_args[1], target_dir).replace(os.sep, "/") for _, task_args in asset_tasks]
+    failures = log_task_results(run_tasks(asset_tasks, jobs))
+    if failures: console.log(f"[bold red]{failures} asset file(s) failed to process.[/bold red]")
+
+    # Asset folders like 'images' and 'menu-data' only transfer what changed
+    with profile_stage("sync asset folders"): sync_asset_folders(jobs=jobs, link_mode=link_mode)
 
     # --- Root icon copies to silence 404s ---
     def safe_copy(src, dst):
@@ -335,75 +1804,1039 @@ def copy_assets() -> None:
     safe_copy(apple_src, os.path.join(target_dir, "apple-touch-icon.png"))
     safe_copy(apple_src, os.path.join(target_dir, "apple-touch-icon-precomposed.png"))
 
-    # PurgeCSS is currently commented out. Uncomment and ensure Node.js setup if needed.
-    # if css_files_to_process_in_docs:
-    #     console.log(f"[cyan]Running PurgeCSS on {len(css_files_to_process_in_docs)} CSS file(s)...[/cyan]")
-    #     purge_script_path = os.path.join(current_script_dir, 'nodejs', 'purge_css.js')
-    #     nodejs_dir = os.path.join(current_script_dir, 'nodejs')
-    #     node_exe_path = "node" 
-    #     command = [node_exe_path, purge_script_path] + css_files_to_process_in_docs
-    #     try:
-    #         subprocess.run(command, check=True, cwd=nodejs_dir, capture_output=True, text=True)
-    #         console.log(f"[green]PurgeCSS completed successfully for all specified CSS files.[/green]")
-    #     except Exception as e:
-    #         console.log(f"[bold red]Error running PurgeCSS: {e}. Ensure Node.js and 'npm install' were run in 'build_utils/nodejs'.[/bold red]")
-    # else: console.log("[yellow]No CSS files found for PurgeCSS to process.[/yellow]")
-    
-    # Copy and minify JavaScript files
-    source_js_folder = os.path.join(source_assets_base, "js")
-    target_js_folder = os.path.join(target_assets_base, "js")
-    if os.path.isdir(source_js_folder):
-        if not os.path.exists(target_js_folder): os.makedirs(target_js_folder, exist_ok=True)
-        for root, _, files in os.walk(source_js_folder):
-            for filename in files:
-                source_file_path = os.path.join(root, filename)
-                relative_path = os.path.relpath(source_file_path, source_js_folder)
-                target_file_path = os.path.join(target_js_folder, relative_path)
-                ensure_target_dir_exists(target_file_path)
-                try:
-                    if filename.endswith(".js") and not filename.endswith(".min.js"):
-                        with open(source_file_path, 'r', encoding='utf-8') as f_in: content = f_in.read()
-                        minified_content = rjsmin.jsmin(content)
-                        with open(target_file_path, 'w', encoding='utf-8') as f_out: f_out.write(minified_content)
-                        console.log(f"Minified JS: {os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
-                    else: shutil.copy2(source_file_path, target_file_path); console.log(f"Copied JS/other directly: {os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
-                except Exception as e: console.log(f"[bold red]Error processing JS {filename}: {e}. Copied original.[/bold red]"); shutil.copy2(source_file_path, target_file_path)
-    else: console.log(f"[yellow]Warning: Source JS folder not found at '{os.path.relpath(source_js_folder, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}'[/yellow]")
-
-    # Final CSS minification
-    console.log("Starting final CSS minification...")
-    if os.path.isdir(target_custom_css_folder): 
-        for root, _, files in os.walk(target_custom_css_folder):
-            for filename in files:
-                if filename.endswith(".css"):
-                    target_file_path = os.path.join(root, filename)
-                    try:
-                        with open(target_file_path, 'r', encoding='utf-8') as f_in: content = f_in.read()
-                        minified_content = rcssmin.cssmin(content)
-                        with open(target_file_path, 'w', encoding='utf-8') as f_out: f_out.write(minified_content)
-                        console.log(f"Minified final CSS: {os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
-                    except Exception as e: console.log(f"[bold red]Error minifying CSS {filename}: {e}. Skipping.[/bold red]")
-    else: console.log("[yellow]No target CSS folder found for final minification.[/yellow]")
-
     console.log("Asset copying and processing complete.")
 
     # Copy root files (e.g., manifest, robots.txt)
     root_files_source_dir = source_dir
-    files_to_copy_from_root = ["humans.txt", "manifest.json", "robots.txt", "sitemap.xml", "sw.js"]
     console.log(f"Copying specific root files.")
-    for file_name in files_to_copy_from_root:
+    for file_name in ROOT_FILES:
         source_file_full_path = os.path.join(root_files_source_dir, file_name)
         target_file_full_path = os.path.join(target_dir, file_name)
         if os.path.isfile(source_file_full_path):
+            asset_outputs.append(file_name)
             try: shutil.copy2(source_file_full_path, target_file_full_path)
             except IOError as e: console.log(f"[bold red]Error copying root file {file_name}: {e}[/bold red]")
         else: console.log(f"[yellow]Warning: Root file '{os.path.relpath(source_file_full_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' not found.[/yellow]")
-    
+
+    # Outputs of CSS/JS and root files deleted since the last build
+    prune_asset_outputs(asset_outputs)
+
     console.log("Asset copying and full asset processing complete.")
 
+def prune_asset_outputs(asset_outputs: list) -> None:
+    """
+    Records the CSS/JS and root file outputs of `copy_assets()` in the build manifest and
+    deletes those recorded by the previous build whose sources are gone, with their
+    compressed siblings (their fingerprinted copies are pruned by `fingerprint_assets()`).
+
+    Args:
+        asset_outputs (list): The written output paths, relative to the target folder.
+    """
+    manifest = load_build_manifest()
+    pruned_count = 0
+    for relative_path in sorted(set(manifest["assets"]) - set(asset_outputs)):
+        stale_output_path = os.path.join(target_dir, relative_path)
+        if not os.path.isfile(stale_output_path): continue
+        remove_stale_output(stale_output_path)
+        pruned_count += 1
+        console.log(f"Pruned: {os.path.relpath(stale_output_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
+    manifest["assets"] = sorted(asset_outputs)
+    save_build_manifest(manifest)
+    if pruned_count: console.log(f"Pruned {pruned_count} asset output(s) whose sources were removed.")
+
+def fingerprint_assets() -> dict:
+    """
+    Writes content-hashed copies of the minified CSS and JS files in 'docs/assets'.
+
+    JavaScript modules are processed imports-first, so relative `import ... from './x.js'`
+    specifiers inside a fingerprinted copy point at fingerprinted copies too, and a
+    change to an imported module changes the hash of every importer. The unhashed
+    files are kept for anything still referring to them. Stale fingerprinted copies
+    are removed, references in 'sw.js' are rewritten, and the resulting map is
+    saved to 'assets/asset-map.json' in the output folder.
+
+    Returns:
+        dict: The asset map, e.g. {"css/custom_css.css": "css/custom_css.1a2b3c4d5e.css"}.
+    """
+    target_assets_base = os.path.join(target_dir, "assets")
+    asset_paths = []
+    for folder_name in FINGERPRINTED_ASSET_FOLDERS:
+        for root, dirs, files in os.walk(os.path.join(target_assets_base, folder_name)):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.endswith((".css", ".js")) and not FINGERPRINTED_NAME_PATTERN.search(filename):
+                    asset_paths.append(os.path.relpath(os.path.join(root, filename), target_assets_base).replace(os.sep, "/"))
+
+    asset_map = {}
+    in_progress = set()
+
+    def fingerprint(asset_path: str) -> None:
+        if asset_path in asset_map or asset_path in in_progress: return
+        in_progress.add(asset_path)
+        with open(os.path.join(target_assets_base, asset_path), "r", encoding="utf-8") as f: content = f.read()
+        if asset_path.endswith(".js"):
+            def replace_import(match):
+                imported_path = os.path.normpath(os.path.join(os.path.dirname(asset_path), match.group(3))).replace(os.sep, "/")
+                if imported_path not in asset_paths: return match.group(0)
+                fingerprint(imported_path)
+                if imported_path not in asset_map: return match.group(0)  # import cycle: keep the unhashed module
+                specifier = os.path.relpath(asset_map[imported_path], os.path.dirname(asset_path)).replace(os.sep, "/")
+                if not specifier.startswith("."): specifier = f"./{specifier}"
+                return f"{match.group(1)}{match.group(2)}{specifier}{match.group(2)}"
+            content = JS_IMPORT_PATTERN.sub(replace_import, content)
+        stem, extension = os.path.splitext(asset_path)
+        fingerprinted_path = f"{stem}.{hash_bytes(content.encode('utf-8'))[:FINGERPRINT_LENGTH]}{extension}"
+        fingerprinted_file_path = os.path.join(target_assets_base, fingerprinted_path)
+        if not os.path.isfile(fingerprinted_file_path):
+            with open(fingerprinted_file_path, "w", encoding="utf-8") as f: f.write(content)
+        asset_map[asset_path] = fingerprinted_path
+        in_progress.discard(asset_path)
+
+    for asset_path in asset_paths: fingerprint(asset_path)
+
+    # Remove fingerprinted copies left over from previous builds
+    current_files = set(asset_map.values())
+    for folder_name in FINGERPRINTED_ASSET_FOLDERS:
+        for root, _, files in os.walk(os.path.join(target_assets_base, folder_name)):
+            for filename in files:
+                relative_path = os.path.relpath(os.path.join(root, filename), target_assets_base).replace(os.sep, "/")
+                if FINGERPRINTED_NAME_PATTERN.search(filename) and relative_path not in current_files:
+                    os.remove(os.path.join(root, filename))
+
+    service_worker_path = os.path.join(target_dir, "sw.js")
+    if os.path.isfile(service_worker_path):
+        with open(service_worker_path, "r", encoding="utf-8") as f: service_worker = f.read()
+        with open(service_worker_path, "w", encoding="utf-8") as f: f.write(rewrite_asset_references(service_worker, asset_map))
+
+    with open(os.path.join(target_assets_base, ASSET_MAP_FILE_NAME), "w", encoding="utf-8") as f: json.dump(asset_map, f, indent=2, sort_keys=True)
+    console.log(f"Fingerprinted {len(asset_map)} CSS/JS file(s).")
+    return asset_map
+
+def parse_css_rules(css: str) -> list:
+    """
+    Splits a (minified) stylesheet into `(prelude, body)` rules.
+
+    Grouping at-rules such as `@media` get a list of nested rules as their body, other
+    blocks (style rules, `@keyframes`, `@font-face`) keep their body as text, and
+    statements such as `@import` get `None`. Comments are dropped.
+    """
+    rules = []
+    stack = [rules]
+    preludes = []
+    start = 0
+    index = 0
+
+    def skip_string(position: int) -> int:
+        quote = css[position]
+        position += 1
+        while position < len(css) and css[position] != quote:
+            position += 2 if css[position] == "\\" else 1
+        return position
+
+    while index < len(css):
+        char = css[index]
+        if char in "\"'":
+            index = skip_string(index)
+        elif css.startswith("/*", index):
+            end = css.find("*/", index + 2)
+            end = len(css) if end == -1 else end + 2
+            css = css[:index] + css[end:]
+            continue
+        elif char == "{":
+            prelude = css[start:index].strip()
+            if prelude.lower().startswith(CSS_GROUPING_AT_RULES):
+                preludes.append(prelude)
+                stack.append([])
+            else:
+                depth = 1
+                end = index + 1
+                while end < len(css) and depth:
+                    if css[end] in "\"'": end = skip_string(end)
+                    elif css[end] == "{": depth += 1
+                    elif css[end] == "}": depth -= 1
+                    end += 1
+                stack[-1].append((prelude, css[index + 1:end - 1]))
+                index = end - 1
+            start = index + 1
+        elif char == ";" and css[start:index].strip().startswith("@"):
+            stack[-1].append((css[start:index].strip(), None))
+            start = index + 1
+        elif char == "}" and len(stack) > 1:
+            nested_rules = stack.pop()
+            stack[-1].append((preludes.pop(), nested_rules))
+            start = index + 1
+        index += 1
+    return rules
+
+def serialize_css_rules(rules: list) -> str:
+    """
+    Turns rules from `parse_css_rules()` back into minified CSS, dropping empty groups.
+    """
+    parts = []
+    for prelude, body in rules:
+        if body is None: parts.append(f"{prelude};")
+        elif isinstance(body, list):
+            nested_css = serialize_css_rules(body)
+            if nested_css: parts.append(f"{prelude}{{{nested_css}}}")
+        else: parts.append(f"{prelude}{{{body}}}")
+    return "".join(parts)
+
+def split_selector_list(prelude: str) -> list:
+    """
+    Splits a selector list on the commas that are not inside parentheses or attribute brackets.
+    """
+    selectors = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(prelude):
+        if char in "([": depth += 1
+        elif char in ")]": depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(prelude[start:index].strip())
+            start = index + 1
+    selectors.append(prelude[start:].strip())
+    return [selector for selector in selectors if selector]
+
+def filter_style_rules(rules: list, keep_selector) -> list:
+    """
+    Keeps the selectors of style rules for which `keep_selector(selector)` is true, recursing
+    into grouping at-rules. Rules left without selectors are dropped; other at-rules are kept.
+    """
+    filtered_rules = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            filtered_rules.append((prelude, filter_style_rules(body, keep_selector)))
+        elif prelude.startswith("@"):
+            filtered_rules.append((prelude, body))
+        else:
+            kept_selectors = [selector for selector in split_selector_list(prelude) if keep_selector(selector)]
+            if kept_selectors: filtered_rules.append((",".join(kept_selectors), body))
+    return filtered_rules
+
+def is_selector_used(selector: str, used_tokens: set) -> bool:
+    """
+    Whether every class, id and tag name of a selector appears in the site content or the safelist.
+
+    Selectors with a safelisted pattern anywhere are kept whole, like PurgeCSS's greedy safelist.
+    Pseudo-classes and attribute selectors are ignored, and escaped selectors are always kept.
+    """
+    if "\\" in selector: return True
+    identifiers = [name for _, name in SELECTOR_IDENTIFIER_PATTERN.findall(SELECTOR_IGNORED_PATTERN.sub(" ", selector))]
+    if any(pattern.search(name) for name in identifiers for pattern in PURGE_SAFELIST_PATTERNS): return True
+    return all(name in used_tokens or name in PURGE_SAFELIST for name in identifiers)
+
+class FoldElementCollector(HTMLParser):
+    """
+    Collects `(tag, classes, id)` for `<html>`, `<body>` and the first `limit` elements inside `<body>`.
+    """
+    def __init__(self, limit: int = CRITICAL_FOLD_ELEMENTS):
+        super().__init__()
+        self.limit = limit
+        self.in_body = False
+        self.body_elements = 0
+        self.elements = []
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        element = (tag, set((attributes.get("class") or "").split()), attributes.get("id"))
+        if tag in ("html", "body"):
+            self.elements.append(element)
+            self.in_body = self.in_body or tag == "body"
+        elif self.in_body and self.body_elements < self.limit:
+            self.elements.append(element)
+            self.body_elements += 1
+
+def is_selector_critical(selector: str, fold_elements: list) -> bool:
+    """
+    Whether every compound of a selector (`.a`, `li.b`, `#c`) matches one of the above-the-fold elements.
+
+    Ancestry and pseudo-classes are not checked, so this errs on the side of inlining.
+    """
+    for compound in re.split(r"[\s>+~]+", SELECTOR_IGNORED_PATTERN.sub("", selector).strip()):
+        identifiers = SELECTOR_IDENTIFIER_PATTERN.findall(compound)
+        tag = next((name.lower() for prefix, name in identifiers if not prefix), None)
+        classes = {name for prefix, name in identifiers if prefix == "."}
+        element_id = next((name for prefix, name in identifiers if prefix == "#"), None)
+        if not any((tag is None or tag == element[0]) and classes <= element[1] and (element_id is None or element_id == element[2])
+                   for element in fold_elements): return False
+    return True
+
+def extract_critical_css(rules: list, fold_elements: list) -> str:
+    """
+    Builds the critical stylesheet for one page: the style rules matching its above-the-fold
+    elements (inside their `@media` groups), plus the `@keyframes` those rules use.
+    """
+    critical_rules = filter_style_rules(rules, lambda selector: is_selector_critical(selector, fold_elements))
+
+    def without_at_rules(rules: list) -> list:
+        return [(prelude, without_at_rules(body) if isinstance(body, list) else body)
+                for prelude, body in rules if isinstance(body, list) or not prelude.startswith("@")]
+
+    critical_css = serialize_css_rules(without_at_rules(critical_rules))
+    used_names = set(CSS_CONTENT_TOKEN_PATTERN.findall(critical_css))
+    keyframes = [(prelude, body) for prelude, body in rules
+                 if prelude.lower().startswith(("@keyframes", "@-webkit-keyframes")) and prelude.split()[-1] in used_names]
+    return critical_css + serialize_css_rules(keyframes)
+
+def purge_and_inline_css(asset_map: dict) -> dict:
+    """
+    Purges unused selectors from `PURGED_STYLESHEETS` and inlines each page's critical CSS.
+
+    Selectors are kept when all their class, id and tag names appear in the rendered
+    'docs/**/*.html' or 'docs/assets/js' (or in the safelist). The purged file is then
+    re-fingerprinted. In every page, the stylesheet `<link>` marked `data-critical-css`
+    is preceded by an inline `<style>` with the rules matching the page's first
+    `CRITICAL_FOLD_ELEMENTS` elements and switched to a non-blocking load (with a
+    `<noscript>` fallback). Pages that were already processed are updated in place.
+
+    Args:
+        asset_map (dict): The asset map from `fingerprint_assets()`.
+
+    Returns:
+        dict: The asset map after re-fingerprinting the purged stylesheets.
+    """
+    target_assets_base = os.path.join(target_dir, "assets")
+    html_files = []
+    content_paths = []
+    for root, dirs, files in os.walk(target_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            file_path = os.path.join(root, filename)
+            if filename.endswith(".html"):
+                html_files.append(file_path)
+                content_paths.append(file_path)
+            elif filename.endswith(".js") and os.path.relpath(root, target_assets_base).replace(os.sep, "/").split("/")[0] == "js" and not FINGERPRINTED_NAME_PATTERN.search(filename):
+                content_paths.append(file_path)
+
+    used_tokens = set()
+    for file_path in content_paths:
+        with open(file_path, "r", encoding="utf-8") as f: content = f.read()
+        if file_path.endswith(".html"): content = CRITICAL_CSS_BLOCK_PATTERN.sub("", content)  # ignore a previous build's inlined CSS
+        used_tokens.update(CSS_CONTENT_TOKEN_PATTERN.findall(content))
+
+    purged_rules = {}
+    for stylesheet in PURGED_STYLESHEETS:
+        stylesheet_path = os.path.join(target_assets_base, stylesheet)
+        if not os.path.isfile(stylesheet_path):
+            console.log(f"[yellow]Warning: Stylesheet to purge not found: {stylesheet}[/yellow]")
+            continue
+        with open(stylesheet_path, "r", encoding="utf-8") as f: original_css = f.read()
+        rules = filter_style_rules(parse_css_rules(original_css), lambda selector: is_selector_used(selector, used_tokens))
+        purged_css = serialize_css_rules(rules)
+        with open(stylesheet_path, "w", encoding="utf-8") as f: f.write(purged_css)
+        purged_rules[stylesheet] = rules
+        console.log(f"Purged {stylesheet}: {len(original_css)} -> {len(purged_css)} bytes ({100 - len(purged_css) * 100 // max(1, len(original_css))}% removed).")
+
+    if purged_rules: asset_map = fingerprint_assets()
+    fingerprinted_stylesheets = {stylesheet: re.compile(re.escape(os.path.splitext(stylesheet)[0]) + r"(?:\.[0-9a-f]{%d})?\.css$" % FINGERPRINT_LENGTH)
+                                 for stylesheet in purged_rules}
+
+    inlined_count = 0
+    for file_path in html_files:
+        with open(file_path, "r", encoding="utf-8") as f: html = f.read()
+        fold_elements = None
+
+        def inline_stylesheet(match):
+            nonlocal fold_elements, inlined_count
+            href = match.group(1)
+            stylesheet = next((name for name, pattern in fingerprinted_stylesheets.items() if pattern.search(href)), None)
+            if stylesheet is None: return match.group(0)
+            href = fingerprinted_stylesheets[stylesheet].sub(asset_map.get(stylesheet, stylesheet), href)
+            if fold_elements is None:
+                collector = FoldElementCollector()
+                collector.feed(CRITICAL_CSS_BLOCK_PATTERN.sub("", html))
+                fold_elements = collector.elements
+            critical_css = extract_critical_css(purged_rules[stylesheet], fold_elements).replace("</", "<\\/")
+            inlined_count += 1
+            return (f'<style data-critical-css>{critical_css}</style>\n'
+                    f'  <link rel="stylesheet" href="{href}" media="print" onload="this.media=\'all\'" data-critical-css>\n'
+                    f'  <noscript data-critical-css><link rel="stylesheet" href="{href}"></noscript>')
+
+        updated_html = CRITICAL_STYLESHEET_PATTERN.sub(inline_stylesheet, html)
+        if updated_html != html:
+            with open(file_path, "w", encoding="utf-8") as f: f.write(updated_html)
+
+    console.log(f"Inlined critical CSS into {inlined_count} page(s).")
+    return asset_map
+
+def write_precache_manifest(asset_map: dict | None = None) -> None:
+    """
+    Generates the service worker precache manifest from the files written to 'docs'.
+
+    Every file matching `PRECACHE_PATTERNS` becomes a `{url, revision, size}` entry, where
+    pages are listed by route (`menu/`), CSS/JS by their fingerprinted name, and the
+    revision is a hash of the file content. The entries replace the `PRECACHE_MANIFEST`
+    placeholder in 'docs/sw.js', so the worker only re-downloads what actually changed.
+
+    Args:
+        asset_map (dict | None): Unhashed to fingerprinted CSS/JS paths, relative to 'docs/assets'.
+    """
+    asset_map = asset_map or {}
+    service_worker_path = os.path.join(target_dir, "sw.js")
+    if not os.path.isfile(service_worker_path):
+        console.log("[yellow]No 'docs/sw.js' found. Skipping precache manifest.[/yellow]")
+        return
+
+    entries = []
+    for root, dirs, files in os.walk(target_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if FINGERPRINTED_NAME_PATTERN.search(filename): continue
+            relative_path = os.path.relpath(os.path.join(root, filename), target_dir).replace(os.sep, "/")
+            if not any(fnmatch.fnmatchcase(relative_path, pattern) for pattern in PRECACHE_PATTERNS): continue
+            if relative_path.startswith("assets/") and relative_path[len("assets/"):] in asset_map:
+                relative_path = f"assets/{asset_map[relative_path[len('assets/'):]]}"
+            file_path = os.path.join(target_dir, relative_path)
+            url = relative_path[:-len("index.html")] if relative_path.endswith("index.html") else relative_path
+            entries.append({"url": url, "revision": hash_file(file_path)[:PRECACHE_REVISION_LENGTH], "size": os.path.getsize(file_path)})
+    entries.sort(key=lambda entry: entry["url"])
+
+    with open(service_worker_path, "r", encoding="utf-8") as f: service_worker = f.read()
+    if not PRECACHE_MANIFEST_PATTERN.search(service_worker):
+        console.log("[yellow]No PRECACHE_MANIFEST placeholder in 'docs/sw.js'. Skipping precache manifest.[/yellow]")
+        return
+    manifest_js = "const PRECACHE_MANIFEST = [\n" + "".join(f"  {json.dumps(entry)},\n" for entry in entries) + "];"
+    with open(service_worker_path, "w", encoding="utf-8") as f:
+        f.write(PRECACHE_MANIFEST_PATTERN.sub(lambda _: manifest_js, service_worker, count=1))
+    console.log(f"Precache manifest: {len(entries)} file(s), {sum(entry['size'] for entry in entries) / 1024:.1f} KiB.")
+
+def compress_file(file_path: str) -> tuple[bool, str]:
+    """
+    Writes the maximum-level `.gz` (and, with brotli installed, `.br`) sibling of one file.
+
+    Compressed bytes are cached under the content hash of the input, so unchanged files
+    cost one hash and no compression. A sibling is only written when it is smaller than
+    the original; otherwise (or when brotli is missing) any existing sibling is removed.
+    """
+    with open(file_path, "rb") as f: data = f.read()
+    content_hash = hash_bytes(data)
+    encoders = {
+        ".gz": lambda raw: gzip.compress(raw, compresslevel=9, mtime=0),
+        ".br": (lambda raw: brotli.compress(raw, quality=11)) if brotli else None,
+    }
+    written = []
+    for suffix, encoder in encoders.items():
+        sibling_path = file_path + suffix
+        if encoder is None:
+            if os.path.isfile(sibling_path): os.remove(sibling_path)
+            continue
+        cache_file_path = os.path.join(compressed_cache_dir, f"{content_hash}-v{COMPRESSION_VERSION}{suffix}")
+        if os.path.isfile(cache_file_path):
+            with open(cache_file_path, "rb") as f: compressed = f.read()
+            os.utime(cache_file_path)  # mark as used so the cache prune keeps it
+        else:
+            compressed = encoder(data)
+            temp_path = f"{cache_file_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f: f.write(compressed)
+            os.replace(temp_path, cache_file_path)
+        if len(compressed) >= len(data):
+            if os.path.isfile(sibling_path): os.remove(sibling_path)
+            continue
+        if os.path.isfile(sibling_path) and os.path.getsize(sibling_path) == len(compressed):
+            with open(sibling_path, "rb") as f: sibling_is_current = f.read() == compressed
+        else: sibling_is_current = False
+        if not sibling_is_current:
+            with open(sibling_path, "wb") as f: f.write(compressed)
+        written.append(f"{suffix} {len(compressed) * 100 // len(data)}%")
+    relative_path = os.path.relpath(file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))
+    return True, f"Compressed: {relative_path} ({', '.join(written) or 'no gain'})"
+
+def precompress_outputs(jobs: int = 1) -> int:
+    """
+    Writes precompressed siblings for every text output in 'docs', for static serving.
+
+    Files with an extension in `COMPRESSIBLE_EXTENSIONS` and at least `COMPRESSION_MIN_BYTES`
+    are compressed in parallel by `compress_file()`. Siblings whose original is gone or now
+    too small are removed. The shared compression cache is pruned separately by
+    `prune_compressed_cache()`, once every target has been compressed.
+
+    Args:
+        jobs (int): The number of worker processes used for compression.
+
+    Returns:
+        int: The number of files that failed to compress.
+    """
+    os.makedirs(compressed_cache_dir, exist_ok=True)
+    compress_tasks = []
+    removed_count = 0
+    for root, dirs, files in os.walk(target_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            file_path = os.path.join(root, filename)
+            if filename.endswith(COMPRESSED_SUFFIXES):
+                original_path = os.path.splitext(file_path)[0]
+                if not os.path.isfile(original_path) or os.path.getsize(original_path) < COMPRESSION_MIN_BYTES:
+                    os.remove(file_path)
+                    removed_count += 1
+            elif filename.endswith(COMPRESSIBLE_EXTENSIONS) and os.path.getsize(file_path) >= COMPRESSION_MIN_BYTES:
+                compress_tasks.append((compress_file, (file_path,)))
+
+    results = run_tasks(compress_tasks, jobs)
+    failures = log_task_results(results)
+
+    encodings = "gzip and brotli" if brotli else "gzip (install 'brotli' for .br siblings)"
+    console.log(f"Precompressed {len(compress_tasks) - failures} file(s) with {encodings}, removed {removed_count} stale sibling(s).")
+    return failures
+
+def prune_compressed_cache(build_started: float) -> None:
+    """
+    Removes compressed outputs that no target of this build read or wrote.
+
+    `compress_file()` touches every cache entry it uses, so entries older than the start of
+    the build belong to old file versions. Run once after all targets: pruning per target
+    would evict the entries only the other targets use.
+
+    Args:
+        build_started (float): The timestamp taken before the first target was compressed.
+    """
+    if not os.path.isdir(compressed_cache_dir): return
+    removed_count = 0
+    for file_name in os.listdir(compressed_cache_dir):
+        cache_file_path = os.path.join(compressed_cache_dir, file_name)
+        if os.path.getmtime(cache_file_path) < build_started:
+            os.remove(cache_file_path)
+            removed_count += 1
+    if removed_count: console.log(f"Pruned {removed_count} unused compressed output(s) from the cache.")
+
+class PageResourceCollector(HTMLParser):
+    """
+    Collects the resources a page makes the browser fetch, as `(url, kind, render_blocking, lazy)` tuples.
+
+    Stylesheets, preloads, scripts, the first icon, the web app manifest, images (the
+    `src`, or the first WebP candidate of an enclosing `<picture>`), video sources and
+    posters are collected; `<noscript>` fallbacks are ignored. Stylesheets with a
+    `media` that does not apply on load and scripts that are `async`, `defer` or
+    modules in `<head>` are not render-blocking. Images with `loading="lazy"` are lazy.
+    """
+    def __init__(self):
+        super().__init__()
+        self.resources = []
+        self.in_head = False
+        self.noscript_depth = 0
+        self.has_icon = False
+        self.picture_source = None
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: (value if value is not None else "") for name, value in attrs}
+        if tag == "noscript": self.noscript_depth += 1
+        if tag == "head": self.in_head = True
+        elif tag == "body": self.in_head = False
+        if self.noscript_depth: return
+
+        if tag == "link":
+            rel = attributes.get("rel", "").lower().split()
+            href = attributes.get("href")
+            if not href: return
+            if "stylesheet" in rel:
+                media = attributes.get("media", "all").strip().lower()
+                self.resources.append((href, "css", media in ("", "all", "screen") and "disabled" not in attributes, False))
+            elif "preload" in rel or "modulepreload" in rel:
+                self.resources.append((href, attributes.get("as") or ("script" if "modulepreload" in rel else "other"), False, False))
+            elif "icon" in rel and not self.has_icon:
+                self.has_icon = True
+                self.resources.append((href, "image", False, False))
+            elif "manifest" in rel:
+                self.resources.append((href, "other", False, False))
+        elif tag == "script" and attributes.get("src"):
+            deferred = "async" in attributes or "defer" in attributes or attributes.get("type") == "module"
+            self.resources.append((attributes["src"], "js", self.in_head and not deferred, False))
+        elif tag == "picture":
+            self.picture_source = None
+        elif tag == "source" and attributes.get("srcset") and attributes.get("type") == "image/webp" and self.picture_source is None:
+            self.picture_source = attributes["srcset"].split(",")[0].split()[0]
+        elif tag == "source" and attributes.get("src"):
+            self.resources.append((attributes["src"], "video", False, False))
+        elif tag == "img":
+            source = self.picture_source or attributes.get("src") or (attributes.get("srcset") or "").split(",")[0].split(" ")[0]
+            if source and not source.startswith("data:"): self.resources.append((source, "image", False, attributes.get("loading") == "lazy"))
+        elif tag == "video":
+            if attributes.get("poster"): self.resources.append((attributes["poster"], "image", False, False))
+            if attributes.get("src"): self.resources.append((attributes["src"], "video", False, False))
+
+    def handle_endtag(self, tag):
+        if tag == "noscript": self.noscript_depth = max(0, self.noscript_depth - 1)
+        elif tag == "picture": self.picture_source = None
+        elif tag == "head": self.in_head = False
+
+def analyze_page(file_path: str, base_url: str) -> dict:
+    """
+    Resolves the resources of one generated page against 'docs' and sums their cost.
+
+    Local files are measured on disk, using the `.gz` sibling as the transfer size when
+    there is one; the hero frame bundles of the smallest tier count as one `frames`
+    resource each. External URLs are listed and counted as requests, but their size is unknown.
+
+    Returns:
+        dict: The page report: totals (all bytes, and bytes without lazy images), a per-type breakdown, render-blocking, external and missing URLs, and every resource.
+    """
+    with open(file_path, "r", encoding="utf-8") as f: html = f.read()
+    page_directory = os.path.dirname(file_path)
+    collector = PageResourceCollector()
+    collector.feed(html)
+    references = list(collector.resources)
+
+    hero_frames_match = HERO_FRAMES_INDEX_PATTERN.search(html)
+    if hero_frames_match:
+        try:
+            tiers = json.loads(hero_frames_match.group(1)).get("tiers") or []
+            references.extend((bundle, "frames", False, False) for bundle in (min(tiers, key=lambda tier: tier["width"])["bundles"] if tiers else []))
+        except (ValueError, KeyError, TypeError): pass
+
+    def transfer_size(path: str) -> int:
+        compressed_path = f"{path}.gz"
+        return os.path.getsize(compressed_path) if os.path.isfile(compressed_path) else os.path.getsize(path)
+
+    html_transfer_bytes = transfer_size(file_path)
+    report = {
+        "page": os.path.relpath(page_directory, target_dir).replace(os.sep, "/") + "/" if page_directory != target_dir else "",
+        "requests": 1,
+        "bytes": html_transfer_bytes,
+        "initial_bytes": html_transfer_bytes,
+        "render_blocking": [],
+        "external": [],
+        "missing": [],
+        "by_type": {"html": {"requests": 1, "bytes": html_transfer_bytes}},
+        "resources": [],
+    }
+    seen_urls = set()
+    for url, kind, render_blocking, lazy in references:
+        url = url.strip()
+        kind = {"style": "css", "script": "js", "video": "video", "image": "image", "font": "font", "fetch": "other"}.get(kind, kind)
+        absolute_url = url if "://" in url or url.startswith("//") else None
+        if absolute_url and base_url and absolute_url.startswith(base_url):
+            url, absolute_url = "/" + absolute_url[len(base_url):].lstrip("/"), None
+        resource_key = absolute_url or url.split("#")[0].split("?")[0]
+        if resource_key in seen_urls: continue
+        seen_urls.add(resource_key)
+
+        resource = {"url": absolute_url or url, "type": kind, "render_blocking": render_blocking, "lazy": lazy, "external": bool(absolute_url), "bytes": None}
+        if absolute_url:
+            report["external"].append(absolute_url)
+        else:
+            local_path = url.split("#")[0].split("?")[0]
+            if local_path.startswith("/") or local_path.startswith("assets/") or kind == "frames": local_path = os.path.join(target_dir, local_path.lstrip("/"))
+            else: local_path = os.path.join(page_directory, local_path)
+            if not os.path.isfile(local_path):
+                report["missing"].append(url)
+                continue
+            resource["type"] = kind if kind in ("css", "js", "frames") else RESOURCE_TYPES_BY_EXTENSION.get(os.path.splitext(local_path)[1].lower(), kind)
+            resource["bytes"] = transfer_size(local_path)
+            report["bytes"] += resource["bytes"]
+            if not lazy: report["initial_bytes"] += resource["bytes"]
+
+        report["requests"] += 1
+        type_totals = report["by_type"].setdefault(resource["type"], {"requests": 0, "bytes": 0})
+        type_totals["requests"] += 1
+        type_totals["bytes"] += resource["bytes"] or 0
+        if render_blocking: report["render_blocking"].append(resource["url"])
+        report["resources"].append(resource)
+    return report
+
+def check_performance_budgets(base_url: str | None = None) -> int:
+    """
+    Writes the per-page performance report and checks it against the configured budgets.
+
+    Every generated 'docs/**/index.html' is analyzed by `analyze_page()`. The report
+    is written to `.build_cache/performance-report.json`. Budgets come from
+    'performance-budgets.json': a "default" entry and per-page overrides under
+    "pages" (keyed by route, "" for the home page), each with optional limits for
+    "bytes", "initial_bytes", "requests", "render_blocking", "external_requests" and "<type>_bytes"
+    (e.g. "image_bytes"). Pages with missing local resources also count as violations.
+
+    Args:
+        base_url (str | None): The site URL prefix of local absolute references.
+
+    Returns:
+        int: The number of budget violations.
+    """
+    base_url = base_url if base_url is not None else (os.getenv("URL") or (dotenv_values(env_file_path) if os.path.exists(env_file_path) else {}).get("url") or "")
+    budgets = {}
+    if os.path.isfile(performance_budgets_path):
+        try:
+            with open(performance_budgets_path, "r", encoding="utf-8") as f: budgets = json.load(f)
+        except Exception as e: console.log(f"[bold red]Error reading performance budgets: {e}[/bold red]")
+
+    pages = []
+    for root, dirs, files in os.walk(target_dir):
+        dirs.sort()
+        if "index.html" in files: pages.append(analyze_page(os.path.join(root, "index.html"), base_url))
+
+    violations = [] if pages else [f"no pages found in {os.path.relpath(target_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}"]
+    for page in pages:
+        page_budget = {**budgets.get("default", {}), **budgets.get("pages", {}).get(page["page"], {})}
+        measured = {
+            "bytes": page["bytes"],
+            "initial_bytes": page["initial_bytes"],
+            "requests": page["requests"],
+            "render_blocking": len(page["render_blocking"]),
+            "external_requests": len(page["external"]),
+            **{f"{kind}_bytes": totals["bytes"] for kind, totals in page["by_type"].items()},
+        }
+        page["budget"] = page_budget
+        page["violations"] = [f"{metric} {measured.get(metric, 0)} > {limit}" for metric, limit in sorted(page_budget.items()) if measured.get(metric, 0) > limit]
+        page["violations"].extend(f"missing {url}" for url in page["missing"])
+        violations.extend(f"/{page['page']}: {violation}" for violation in page["violations"])
+        console.log(f"Page /{page['page']}: {page['bytes'] / 1024:.1f} KiB local ({page['initial_bytes'] / 1024:.1f} KiB before lazy images), {page['requests']} request(s) "
+                    f"({len(page['external'])} external), {len(page['render_blocking'])} render-blocking.")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(performance_report_path, "w", encoding="utf-8") as f:
+        json.dump({"base_url": base_url, "violations": violations, "pages": pages}, f, indent=2)
+    for violation in violations: console.log(f"[bold red]Performance budget exceeded: {violation}[/bold red]")
+    console.log(f"Performance report for {len(pages)} page(s) written to {os.path.relpath(performance_report_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}.")
+    return len(violations)
+
+def load_build_targets(targets_path: str) -> list:
+    """
+    Reads the build targets of a multi-target build.
+
+    The JSON file holds `{"targets": [...]}`, each target with a unique `name`, an
+    `output` folder (relative to the project root), an optional `url` and optional
+    `env` values overriding those of `.env`.
+
+    Returns:
+        list: Targets as `{"name", "output", "env"}` dicts with absolute output folders
+            and the `url` folded into `env`.
+
+    Raises:
+        ValueError: When the file does not describe a usable list of targets.
+    """
+    with open(targets_path, "r", encoding="utf-8") as f: config = json.load(f)
+    targets = []
+    for entry in config.get("targets", []) if isinstance(config, dict) else []:
+        if not isinstance(entry, dict) or not entry.get("name") or not entry.get("output"):
+            raise ValueError(f"Build target {entry!r} needs a 'name' and an 'output' folder.")
+        env = {key: str(value) for key, value in (entry.get("env") or {}).items()}
+        if entry.get("url"): env["url"] = entry["url"]
+        targets.append({"name": entry["name"], "output": os.path.abspath(os.path.join(current_script_dir, os.pardir, entry["output"])), "env": env})
+    if not targets: raise ValueError(f"No build targets listed in '{targets_path}'.")
+    for key in ("name", "output"):
+        values = [target[key] for target in targets]
+        if len(set(values)) != len(values): raise ValueError(f"Build targets must have distinct '{key}' values.")
+    return targets
+
+def select_build_target(target: dict) -> None:
+    """
+    Points the build stages at a target's output folder. Targets other than the default
+    'docs' folder get their own build manifest and performance report (suffixed with the
+    target name), so each keeps its own incremental state.
+    """
+    global target_dir, build_manifest_path, performance_report_path
+    target_dir = target["output"]
+    suffix = "" if target_dir == default_target_dir else f"-{target['name']}"
+    build_manifest_path = os.path.join(cache_dir, f"build-manifest{suffix}.json")
+    performance_report_path = os.path.join(cache_dir, f"performance-report{suffix}.json")
+    console.log(f"Build target {target['name'] or 'default'}: '{os.path.relpath(target_dir, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}' ({target['env'].get('url') or 'URL from environment'})")
+
+def prepare_target_folder(incremental: bool = False) -> None:
+    """
+    Creates the current target folder, or (outside incremental builds) cleans it while
+    keeping the synced and derived asset folders, which prune their own stale files.
+    """
+    if incremental: os.makedirs(target_dir, exist_ok=True)
+    else: preprocess(preserved_paths=[os.path.join(target_dir, "assets", folder_name) for folder_name in SYNCED_ASSET_FOLDERS + [DERIVED_IMAGES_FOLDER, HERO_FRAMES_FOLDER]])
+
+def mirror_target_outputs(source_root: str, jobs: int = 1, link_mode: str = "copy") -> None:
+    """
+    Mirrors the URL-independent outputs of the first build target into the current one.
+
+    Rendered pages and compressed siblings are left out, since each target produces its
+    own. Binary files (images, video, hero bundles) are placed with `link_mode`; text files
+    are always copied because later stages rewrite some of them in place (`sw.js`, the
+    purged stylesheet). Only files that are missing or differ (by size and mtime, or for
+    text files by content) are transferred, and mirrored files the first target no
+    longer has are pruned.
+
+    Args:
+        source_root (str): The output folder of the first build target.
+        jobs (int): The number of worker processes used for the copies.
+        link_mode (str): "copy", "hardlink" or "reflink".
+    """
+    mirror_tasks = []
+    expected_target_paths = set()
+    for root, dirs, files in os.walk(source_root):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.endswith(".html") or filename.endswith(COMPRESSED_SUFFIXES): continue
+            source_file_path = os.path.join(root, filename)
+            target_file_path = os.path.join(target_dir, os.path.relpath(source_file_path, source_root))
+            expected_target_paths.add(target_file_path)
+            source_stat = os.stat(source_file_path)
+            if os.path.isfile(target_file_path):
+                target_stat = os.stat(target_file_path)
+                if (target_stat.st_size, target_stat.st_mtime_ns) == (source_stat.st_size, source_stat.st_mtime_ns): continue
+                # Minified files are rewritten (with new mtimes) by every build, usually with the same content
+                if target_stat.st_size == source_stat.st_size and filename.endswith(COMPRESSIBLE_EXTENSIONS) and hash_file(target_file_path) == hash_file(source_file_path): continue
+            mirror_tasks.append((sync_file, (source_file_path, target_file_path, "copy" if filename.endswith(COMPRESSIBLE_EXTENSIONS) else link_mode)))
+
+    pruned_count = 0
+    for root, dirs, files in os.walk(target_dir, topdown=False):
+        for filename in files:
+            target_file_path = os.path.join(root, filename)
+            if filename.endswith(".html") or filename.endswith(COMPRESSED_SUFFIXES) or target_file_path in expected_target_paths: continue
+            os.remove(target_file_path)
+            pruned_count += 1
+        if root != target_dir and not os.listdir(root): os.rmdir(root)
+
+    failures = log_task_results(run_tasks(mirror_tasks, jobs))
+    console.log(f"Mirrored shared outputs ({link_mode}): {len(mirror_tasks) - failures} updated, {pruned_count} pruned, {len(expected_target_paths) - len(mirror_tasks)} unchanged.")
+
+def snapshot_sources() -> dict:
+    """
+    Maps every watched source file (templates, partials, assets, root files and `.env`)
+    to its `(mtime_ns, size)`, so polling can tell which files changed.
+    """
+    snapshot = {}
+    for folder_path in [os.path.join(source_dir, "templates"), os.path.join(source_dir, "partials"), source_assets_base]:
+        for root, _, files in os.walk(folder_path):
+            for filename in files:
+                file_path = os.path.join(root, filename)
+                try: file_stat = os.stat(file_path)
+                except FileNotFoundError: continue
+                snapshot[file_path] = (file_stat.st_mtime_ns, file_stat.st_size)
+    for file_path in [env_file_path] + [os.path.join(source_dir, file_name) for file_name in ROOT_FILES]:
+        if os.path.isfile(file_path):
+            file_stat = os.stat(file_path)
+            snapshot[file_path] = (file_stat.st_mtime_ns, file_stat.st_size)
+    return snapshot
+
+def rebuild_changed_sources(changed_paths: list, jobs: int = 1, link_mode: str = "copy") -> str | None:
+    """
+    Rebuilds only the outputs affected by the changed (or deleted) source files.
+
+    CSS/JS files are minified or copied on their own, root files are copied, and image,
+    menu-data and video changes go through the asset sync stage. Template, partial,
+    `.env`, menu-data and image changes re-render through the incremental page builder,
+    which renders just the pages whose inputs changed: the edited template's page, or the
+    pages that include an edited partial.
+
+    Returns:
+        str | None: "css" when only stylesheets changed (the browser swaps them in place),
+            "reload" for anything else, or None when no output is affected.
+    """
+    global _compiled_partials
+    asset_tasks = []
+    sync_folders = False
+    render_pages = False
+    removed_outputs = 0
+    stylesheets_only = True
+    for changed_path in changed_paths:
+        relative_path = os.path.relpath(changed_path, source_dir).replace(os.sep, "/")
+        path_parts = relative_path.split("/")
+        if changed_path == env_file_path or path_parts[0] in ("templates", "partials"):
+            if path_parts[0] == "partials": _compiled_partials = None
+            render_pages = True
+        elif path_parts[0] == "assets" and len(path_parts) > 2 and path_parts[1] in SYNCED_ASSET_FOLDERS:
+            sync_folders = True
+            # Menu data, item images and hero frames feed the page contexts
+            if path_parts[1] != "videos": render_pages = True
+        elif relative_path in ROOT_FILES:
+            if os.path.isfile(changed_path): asset_tasks.append((copy_file, (changed_path, os.path.join(target_dir, relative_path))))
+            stylesheets_only = False
+        else:
+            asset_task = get_asset_task(changed_path)
+            if asset_task is None: continue
+            target_file_path = asset_task[1][1]
+            if not target_file_path.endswith(".css"): stylesheets_only = False
+            if os.path.isfile(changed_path): asset_tasks.append(asset_task)
+            elif os.path.isfile(target_file_path):
+                os.remove(target_file_path)
+                removed_outputs += 1
+                console.log(f"Removed: {os.path.relpath(target_file_path, os.path.abspath(os.path.join(current_script_dir, os.pardir)))}")
+    if not (asset_tasks or removed_outputs or sync_folders or render_pages): return None
+
+    failures = log_task_results(run_tasks(asset_tasks, jobs))
+    if failures: console.log(f"[bold red]{failures} asset file(s) failed to process.[/bold red]")
+    if sync_folders: sync_asset_folders(jobs=jobs, link_mode=link_mode)
+    if render_pages: static_content_builder(incremental=True, jobs=jobs)
+    return "css" if stylesheets_only and not (sync_folders or render_pages) else "reload"
+
+class LiveReloadChannel:
+    """
+    Hands rebuild notifications ("css" or "reload") to every browser connected to the dev server.
+    """
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.version = 0
+        self.event = None
+
+    def publish(self, event: str) -> None:
+        with self.condition:
+            self.version += 1
+            self.event = event
+            self.condition.notify_all()
+
+    def wait(self, version: int, timeout: float) -> tuple[int, str | None]:
+        """Waits until a notification newer than `version` is published (or `timeout` passes)."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version, self.event
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serves 'docs' for watch mode with caching disabled, a live-reload script injected
+    into every HTML page, and the rebuild notifications as server-sent events at
+    `LIVE_RELOAD_PATH`.
+    """
+    live_reload = LiveReloadChannel()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=target_dir, **kwargs)
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        request_path = self.path.split("?", 1)[0].split("#", 1)[0]
+        if request_path == LIVE_RELOAD_PATH: return self.stream_live_reload()
+        file_path = self.translate_path(self.path)
+        if os.path.isdir(file_path) and request_path.endswith("/"): file_path = os.path.join(file_path, "index.html")
+        if not file_path.endswith(".html") or not os.path.isfile(file_path): return super().do_GET()
+
+        with open(file_path, "r", encoding="utf-8") as f: page_html = f.read()
+        body_end = page_html.rfind("</body>")
+        if body_end == -1: body_end = len(page_html)
+        content = (page_html[:body_end] + LIVE_RELOAD_SCRIPT + page_html[body_end:]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def stream_live_reload(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        version = self.live_reload.version
+        try:
+            while True:
+                latest_version, event = self.live_reload.wait(version, LIVE_RELOAD_KEEPALIVE_SECONDS)
+                if latest_version == version: self.wfile.write(b": keep-alive\n\n")
+                else: self.wfile.write(f"data: {event}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                version = latest_version
+        except (BrokenPipeError, ConnectionResetError): pass
+
+def watch_and_serve(port: int = DEV_SERVER_PORT, jobs: int = 1, link_mode: str = "copy") -> None:
+    """
+    Builds a development copy of the site, serves 'docs' on a local HTTP server and
+    rebuilds the affected outputs whenever a watched source changes, until interrupted.
+
+    The production-only stages (fingerprinting, CSS purge and critical CSS, precache
+    manifest, precompression and budgets) are skipped: pages reference the plain
+    stylesheets and scripts, which the server never lets the browser cache, so a
+    stylesheet edit is one minified file swapped into the open page without a reload.
+
+    Args:
+        port (int): The port the dev server listens on.
+        jobs (int): The number of worker processes used for rebuilds.
+        link_mode (str): How synced assets are placed: "copy", "hardlink" or "reflink".
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    copy_assets(jobs=jobs, link_mode=link_mode)
+    static_content_builder(incremental=True, jobs=jobs)
+
+    server = ThreadingHTTPServer(("", port), DevRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    console.rule(f"[bold green]Serving 'docs' at http://localhost:{port}/ and watching 'src' (Ctrl+C to stop)[/bold green]")
+
+    snapshot = snapshot_sources()
+    try:
+        while True:
+            time.sleep(WATCH_POLL_SECONDS)
+            current_snapshot = snapshot_sources()
+            if current_snapshot == snapshot: continue
+            time.sleep(WATCH_SETTLE_SECONDS)
+            current_snapshot = snapshot_sources()
+            changed_paths = sorted(path for path in set(snapshot) | set(current_snapshot) if snapshot.get(path) != current_snapshot.get(path))
+            snapshot = current_snapshot
+            console.log(f"Changed: {', '.join(os.path.relpath(path, os.path.abspath(os.path.join(current_script_dir, os.pardir))) for path in changed_paths)}")
+            started = time.perf_counter()
+            try: event = rebuild_changed_sources(changed_paths, jobs=jobs, link_mode=link_mode)
+            except Exception as e:
+                console.log(f"[bold red]Rebuild failed: {e}[/bold red]")
+                continue
+            if event is None:
+                console.log("No outputs affected.")
+                continue
+            DevRequestHandler.live_reload.publish(event)
+            console.log(f"[bold green]Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms, notified browsers ({event}).[/bold green]")
+    except KeyboardInterrupt: console.log("Stopping watch mode.")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses the command line options of the build script.
+    """
+    parser = argparse.ArgumentParser(description="Build the static site from 'src' into 'docs'.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Keep 'docs' and re-render only pages whose templates, partials, data or context changed.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="Number of worker processes for rendering, minification and copies (0 = one per CPU core).")
+    parser.add_argument("--link-assets", choices=ASSET_LINK_MODES, default="copy",
+                        help="How synced image/menu-data/video files are placed in 'docs' (links fall back to copies).")
+    parser.add_argument("--profile", nargs="?", const=profile_default_path, metavar="PATH",
+                        help="Record per-stage and per-file timings and bytes to PATH (JSON with Chrome trace events; "
+                             "default '.build_cache/build-profile.json').")
+    parser.add_argument("--ignore-budgets", action="store_true",
+                        help="Write the performance report but do not fail the build when a page exceeds its budget.")
+    parser.add_argument("--targets", nargs="?", const=build_targets_default_path, metavar="PATH",
+                        help="Build every target listed in PATH (URL, env overrides, output folder) in one pass, "
+                             "sharing data, compiled templates and processed assets (default 'build-targets.json').")
+    parser.add_argument("--watch", action="store_true",
+                        help="Serve 'docs' locally with live reload and rebuild only the outputs affected by each source change.")
+    parser.add_argument("--port", type=int, default=DEV_SERVER_PORT,
+                        help=f"Port of the watch mode dev server (default {DEV_SERVER_PORT}).")
+    args = parser.parse_args()
+    if args.jobs <= 0: args.jobs = os.cpu_count() or 1
+    return args
+
 if __name__ == "__main__":
+    args = parse_arguments()
+    if args.watch:
+        os.environ.setdefault("URL", f"http://localhost:{args.port}/")
+        watch_and_serve(port=args.port, jobs=args.jobs, link_mode=args.link_assets)
+        sys.exit(0)
+    try: build_targets = load_build_targets(args.targets) if args.targets else [{"name": "", "output": target_dir, "env": {}}]
+    except (OSError, ValueError) as e:
+        console.log(f"[bold red]Error reading build targets: {e}[/bold red]")
+        sys.exit(1)
+    if args.profile: start_profiling()
     console.rule("[bold green]Starting Static Site Generation[/bold green]")
-    preprocess()
-    static_content_builder()
-    copy_assets()
+    budget_violations = 0
+    compression_failures = 0
+    build_started = datetime.datetime.now().timestamp()
+    with profile_stage("build"):
+        # URL-independent stages run once, into the first target's output folder
+        select_build_target(build_targets[0])
+        with profile_stage("preprocess"): prepare_target_folder(incremental=args.incremental)
+        with profile_stage("copy assets"): copy_assets(jobs=args.jobs, link_mode=args.link_assets)
+        with profile_stage("fingerprint assets"): asset_map = fingerprint_assets()
+        with profile_stage("site data"): site_data = load_site_data(jobs=args.jobs)
+        for build_target in build_targets:
+            stage_suffix = f" ({build_target['name']})" if len(build_targets) > 1 else ""
+            if build_target is not build_targets[0]:
+                select_build_target(build_target)
+                with profile_stage(f"mirror outputs{stage_suffix}"):
+                    prepare_target_folder(incremental=args.incremental)
+                    mirror_target_outputs(build_targets[0]["output"], jobs=args.jobs, link_mode=args.link_assets)
+            with profile_stage(f"static content{stage_suffix}"):
+                static_content_builder(incremental=args.incremental, jobs=args.jobs, asset_map=asset_map, site_data=site_data, env_overrides=build_target["env"])
+            with profile_stage(f"purge and critical css{stage_suffix}"): target_asset_map = purge_and_inline_css(asset_map)
+            with profile_stage(f"precache manifest{stage_suffix}"): write_precache_manifest(target_asset_map)
+            with profile_stage(f"precompress{stage_suffix}"): compression_failures += precompress_outputs(jobs=args.jobs)
+            with profile_stage(f"performance budgets{stage_suffix}"): budget_violations += check_performance_budgets(base_url=build_target["env"].get("url"))
+        # Cached outputs not used by any target belong to old file versions
+        if not compression_failures: prune_compressed_cache(build_started)
+    if args.profile: write_build_profile(args.profile)
+    if budget_violations and not args.ignore_budgets:
+        console.rule(f"[bold red]Build failed: {budget_violations} performance budget violation(s)[/bold red]")
+        sys.exit(1)
     console.rule("[bold green]Static Site Generation Complete[/bold green]")
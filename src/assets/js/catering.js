@@ -1,19 +1,13 @@
 import { initializeForm } from './formHandler.js';
 import { itemModal } from './itemModal.js';
 import { scrollspyeHighlight } from './scrollspye.js';
-import { showMenuItems } from './showMenuItems.js';
-// import { menuData } from '../menu-data/menuData.js';
 
+// The catering menu is rendered at build time from cateringData.json (partials/menu-sections.hbs)
 document.addEventListener("DOMContentLoaded", () => {
-  const menuData = window.tigrisCateringData; 
-
-  handleMenuData(menuData);
+  handleMenu();
 });
 
-function handleMenuData(menu) {
-  // display menu items
-  showMenuItems(menu, 'catering');
-  
+function handleMenu() {
   // scrollspy navbar
   scrollspyeHighlight();
   
@@ -202,14 +202,6 @@ class TigrisGallery {
 document.addEventListener('DOMContentLoaded', () => {
   const gallery = new TigrisGallery();
   gallery.respectReducedMotion();
-  // Access the inlined gallery data
-  const galleryItems = window.tigrisGalleryItems;
-
-  if (galleryItems) {
-    // console.log('Gallery data accessed from inlined script:', galleryItems);
-  } else {
-    console.warn('Inlined gallery data (window.tigrisGalleryItems) not found.');
-  }
 
   // Fancybox initialization
   if (typeof Fancybox !== 'undefined') {
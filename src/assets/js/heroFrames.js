@@ -1,13 +1,17 @@
 /**
  * heroFrames.js
  * Scroll-driven JPEG frame sequence for the home hero.
+ * Frames come from the bundles described by window.__HERO_FRAMES__ (built by
+ * index.py), falling back to one request per frame when no index is present.
  * Requires GSAP + ScrollTrigger loaded before this script.
  */
 (function () {
   'use strict';
 
-  var FRAME_COUNT = 145;
-  var FRAME_BASE  = (window.__SITE_URL__ || '/') + 'assets/images/hero/frames/frame-';
+  var SITE_URL    = window.__SITE_URL__ || '/';
+  var PACKED      = window.__HERO_FRAMES__ || null;
+  var FRAME_COUNT = PACKED ? PACKED.count : 145;
+  var FRAME_BASE  = SITE_URL + 'assets/images/hero/frames/frame-';
 
   var canvas = document.getElementById('hero-canvas');
   if (!canvas) return;
@@ -44,24 +48,67 @@
 
   function pad(i) { return String(i + 1).padStart(4, '0'); }
 
-  function loadFrame(i) {
+  function showFrame(i, src) {
     var img = new Image();
     img.decoding = 'async';
     img.onload = function () {
       images[i] = img;
-      if (i === 0) coverDraw(img); // draw first frame as soon as it arrives
+      if (i === 0 || i === currentFrame) coverDraw(img); // draw first frame as soon as it arrives
     };
-    img.src = FRAME_BASE + pad(i) + '.jpeg';
+    img.src = src;
   }
 
-  // Frame 0 — high priority, starts immediately.
-  loadFrame(0);
+  function loadFrame(i) { showFrame(i, FRAME_BASE + pad(i) + '.jpeg'); }
+
+  // Smallest tier that still covers the viewport's longest side; the full tier otherwise.
+  function pickTier(tiers) {
+    var needed = Math.max(window.innerWidth, window.innerHeight);
+    var sorted = tiers.slice().sort(function (a, b) { return (a.width || Infinity) - (b.width || Infinity); });
+    for (var t = 0; t < sorted.length; t++) {
+      if (!sorted[t].width || sorted[t].width >= needed) return sorted[t];
+    }
+    return sorted[sorted.length - 1];
+  }
+
+  // Fetch one bundle and cut its frames out by byte range.
+  function loadBundle(tier, bundleIndex) {
+    return fetch(SITE_URL + tier.bundles[bundleIndex])
+      .then(function (response) {
+        if (!response.ok) throw new Error('HTTP ' + response.status);
+        return response.arrayBuffer();
+      })
+      .then(function (buffer) {
+        tier.frames.forEach(function (entry, i) {
+          if (entry[0] !== bundleIndex) return;
+          var blob = new Blob([buffer.slice(entry[1], entry[1] + entry[2])], { type: PACKED.type });
+          showFrame(i, URL.createObjectURL(blob));
+        });
+      });
+  }
 
   // Remaining frames — defer to keep bandwidth free for frame 0 + critical assets.
   var idle = window.requestIdleCallback || function (cb) { setTimeout(cb, 150); };
-  idle(function () {
-    for (var i = 1; i < FRAME_COUNT; i++) loadFrame(i);
-  });
+
+  if (PACKED && PACKED.tiers && PACKED.tiers.length && window.fetch) {
+    var tier = pickTier(PACKED.tiers);
+    // Bundle 0 holds frame 0 alone — high priority, starts immediately.
+    loadBundle(tier, 0).catch(function () { loadFrame(0); });
+    idle(function () {
+      for (var b = 1; b < tier.bundles.length; b++) {
+        (function (bundleIndex) {
+          loadBundle(tier, bundleIndex).catch(function () {
+            tier.frames.forEach(function (entry, i) { if (entry[0] === bundleIndex) loadFrame(i); });
+          });
+        })(b);
+      }
+    });
+  } else {
+    // Frame 0 — high priority, starts immediately.
+    loadFrame(0);
+    idle(function () {
+      for (var i = 1; i < FRAME_COUNT; i++) loadFrame(i);
+    });
+  }
 
   // ── GSAP ScrollTrigger ----------------------------------------------------
   if (typeof gsap === 'undefined' || typeof ScrollTrigger === 'undefined') {
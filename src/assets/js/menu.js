@@ -1,41 +1,33 @@
 /**
  * menu.js - Tigris Mediterranean Food Menu
  *
- * This script handles the dynamic creation and interaction of the menu.
+ * This script adds interaction to the menu. The menu sections and item cards
+ * are rendered at build time from menuData.json (partials/menu-sections.hbs).
  * It performs the following functions:
  *
- * 1. Fetch menu.json containing categories with details for each 
- *    menu item (name, price, description, images)
- * 2. Dynamically generates menu item cards using DOM manipulation
- * 3. Implements smooth scrolling navigation between menu categories
- * 4. Uses Intersection Observer for scrollspy functionality to highlight
+ * 1. Implements smooth scrolling navigation between menu categories
+ * 2. Uses Intersection Observer for scrollspy functionality to highlight
  *    the active menu category in the navigation
- * 5. Manages modal interactions for viewing item details and zooming images
- * 6. Handles image preloading with loading animations
- * 7. Provides cart functionality for adding items
+ * 3. Manages modal interactions for viewing item details and zooming images
+ * 4. Handles image preloading with loading animations
  *
- * The script initializes when the DOM is fully loaded, generating the menu
- * and setting up all event listeners and observers.
+ * The script initializes when the DOM is fully loaded, setting up all
+ * event listeners and observers.
  */
 
-import { showMenuItems } from './showMenuItems.js';
 import { scrollspyeHighlight } from './scrollspye.js';
 import { itemModal } from './itemModal.js';
 
 document.addEventListener("DOMContentLoaded", () => {
-  const menuData = window.tigrisMenuData;
-  handleMenuData(menuData);
+  handleMenu();
 });
 
-function handleMenuData(menu) {
-  if (!menu || typeof menu !== 'object' || Object.keys(menu).length === 0) {
-    console.error("handleMenuData: Invalid or empty menu data provided.", menu);
+function handleMenu() {
+  if (!document.querySelector('#main-menu .menu-card')) {
+    console.error("handleMenu: No menu items found in #main-menu.");
     return;
   }
 
-  // Display menu items
-  showMenuItems(menu, 'menu');
-
   // Initialize scrollspy for navbar highlighting
   scrollspyeHighlight();
 
@@ -1,91 +1,113 @@
 // service worker for Tigris PWA
-// Caches all routes, key assets, and an offline page
+// Precaches the routes and key assets listed in PRECACHE_MANIFEST, plus an offline page.
+// On update, only entries whose revision changed are downloaded and only stale ones evicted.
 
-const CACHE_NAME = "tigris-pwa-v1";
-const OFFLINE_PAGE = "/offline.html";
+const PRECACHE_NAME = "tigris-precache";
+const RUNTIME_CACHE_NAME = "tigris-runtime-v1";
+const OFFLINE_PAGE = "offline/";
 
-// List all routes (compiled Handlebars pages)
-const ROUTES_TO_CACHE = [
-  "/",
-  "/menu",
-  "/gallery",
-  "/catering",
-  "/our-story",
-  "/contact",
-  "/privacy",
-  "/terms"
-];
+// Generated by build_utils/index.py from the files written to docs/:
+// [{ url, revision, size }, ...] with urls relative to the service worker scope.
+const PRECACHE_MANIFEST = [];
 
-// List static assets to cache (CSS, JS, key images)
-const ASSETS_TO_CACHE = [
-  "/assets/css/custom_css.css?v=20260408",
-  "/assets/js/jarallax.js",
-  "/assets/js/gallery.js",
-  "/assets/js/menu.js",
-  "/assets/js/a11y-ux.js",
-  "/assets/js/showMenuItems.js",
-  "/assets/js/scrollspye.js",
-  "/assets/js/scrollbar.js",
-  "/assets/js/prefetch.js",
-  "/assets/js/navbar.js",
-  "/assets/js/menu-schema.js",
-  "/assets/js/itemModal.js",
-  "/assets/js/homeAnimation.js",
-  "/assets/js/formHandler.js",
-  "/assets/js/contact.js",
-  "/assets/js/catering.js",
-  "/assets/js/alertModal.js",
-  "/assets/images/logo/red_logo_240x170.jpeg",
-  "/assets/images/logo/red_logo_120X85.jpeg",
-  "/offline"
-];
+// Each entry is cached under its URL plus its revision, so a changed file gets a new key
+function precacheKey(entry) {
+  const url = new URL(entry.url, self.registration.scope);
+  url.searchParams.set("__rev", entry.revision);
+  return url.href;
+}
 
-// Combine routes + assets + offline page
-const CACHE_ASSETS = [...ROUTES_TO_CACHE, ...ASSETS_TO_CACHE, OFFLINE_PAGE];
+function precacheKeysByUrl() {
+  const keys = new Map();
+  PRECACHE_MANIFEST.forEach((entry) => {
+    keys.set(new URL(entry.url, self.registration.scope).href, precacheKey(entry));
+  });
+  return keys;
+}
 
-// Install event: cache all files
+// Precache key for a request, treating "/menu" and "/menu/" as the same route
+function lookupPrecacheKey(keys, requestUrl) {
+  const url = new URL(requestUrl);
+  url.search = "";
+  url.hash = "";
+  if (keys.has(url.href)) return keys.get(url.href);
+  if (!url.pathname.endsWith("/") && !url.pathname.split("/").pop().includes(".")) {
+    url.pathname += "/";
+    if (keys.has(url.href)) return keys.get(url.href);
+  }
+  return null;
+}
+
+// Install event: download only the entries whose revision is not cached yet
 self.addEventListener("install", (event) => {
-  console.log("[SW] Installing service worker and caching assets...");
+  console.log("[SW] Installing service worker and updating precache...");
   event.waitUntil(
-    caches.open(CACHE_NAME).then((cache) => {
-      return cache.addAll(CACHE_ASSETS);
-    })
+    caches.open(PRECACHE_NAME).then((cache) =>
+      Promise.all(
+        PRECACHE_MANIFEST.map((entry) => {
+          const key = precacheKey(entry);
+          return cache.match(key).then((cached) => {
+            if (cached) return;
+            const url = new URL(entry.url, self.registration.scope).href;
+            return fetch(url, { cache: "reload" }).then((response) => {
+              if (!response.ok) throw new Error(`[SW] Failed to precache ${url}: ${response.status}`);
+              return cache.put(key, response);
+            });
+          });
+        })
+      )
+    )
   );
   self.skipWaiting();
 });
 
-// Activate event: cleanup old caches
+// Activate event: evict stale precache entries and old caches
 self.addEventListener("activate", (event) => {
   console.log("[SW] Activating service worker...");
+  const currentKeys = new Set(precacheKeysByUrl().values());
   event.waitUntil(
-    caches.keys().then((keys) => {
-      return Promise.all(
-        keys
-          .filter((key) => key !== CACHE_NAME)
-          .map((key) => caches.delete(key))
-      );
-    })
+    Promise.all([
+      caches.open(PRECACHE_NAME).then((cache) =>
+        cache.keys().then((requests) =>
+          Promise.all(
+            requests
+              .filter((request) => !currentKeys.has(request.url))
+              .map((request) => cache.delete(request))
+          )
+        )
+      ),
+      caches.keys().then((keys) =>
+        Promise.all(
+          keys
+            .filter((key) => key !== PRECACHE_NAME && key !== RUNTIME_CACHE_NAME)
+            .map((key) => caches.delete(key))
+        )
+      ),
+    ])
   );
   self.clients.claim();
 });
 
-// Fetch event: serve from cache first, fallback to network, then offline page
+// Fetch event: serve precached entries, then runtime cache, then network, then offline page
 self.addEventListener("fetch", (event) => {
   if (event.request.method !== "GET") return;
 
+  const keys = precacheKeysByUrl();
+  const key = lookupPrecacheKey(keys, event.request.url);
+
   event.respondWith(
-    caches.match(event.request).then((cached) => {
+    (key ? caches.open(PRECACHE_NAME).then((cache) => cache.match(key)) : caches.match(event.request)).then((cached) => {
       if (cached) return cached;
 
       return fetch(event.request)
         .then((response) => {
           // Only cache successful requests
-          if (!response || response.status !== 200 || response.type !== "basic") {
+          if (key || !response || response.status !== 200 || response.type !== "basic") {
             return response;
           }
 
           const responseClone = response.clone();
-          caches.open(CACHE_NAME).then((cache) => {
+          caches.open(RUNTIME_CACHE_NAME).then((cache) => {
             cache.put(event.request, responseClone);
           });
 
@@ -93,7 +115,8 @@ self.addEventListener("fetch", (event) => {
         })
         .catch(() => {
           // Network failed, fallback to offline page
-          return caches.match(OFFLINE_PAGE);
+          const offlineKey = lookupPrecacheKey(keys, new URL(OFFLINE_PAGE, self.registration.scope).href);
+          return offlineKey ? caches.open(PRECACHE_NAME).then((cache) => cache.match(offlineKey)) : undefined;
         });
     })
   );